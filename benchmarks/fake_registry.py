@@ -0,0 +1,146 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+# Local stand-in for the package registry API (packages.ecosyste.ms) used by
+# lib4package to retrieve package metadata. Responses are generated from the
+# package name so that no network access is required.
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REGISTRY_URL = "https://packages.ecosyste.ms"
+
+PACKAGE_PATH = re.compile(
+    r"^/api/v1/registries/[^/]+/packages/(?P<name>[^/]+)"
+    r"(?:/versions/(?P<version>[^/]+))?$"
+)
+
+
+class RegistryHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        # Suppress logging of requests
+        pass
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        registry = self.server.registry
+        registry.count_request()
+        if registry.latency > 0:
+            time.sleep(registry.latency)
+        match = PACKAGE_PATH.match(self.path)
+        if match is None or registry.is_unknown(match.group("name")):
+            self._send(404, {"error": "Not found"})
+            return
+        name = match.group("name")
+        version = match.group("version")
+        if version is not None:
+            digest = hashlib.sha256(f"{name}-{version}".encode()).hexdigest()
+            self._send(
+                200,
+                {
+                    "number": version,
+                    "published_at": "2024-01-02T03:04:05.000Z",
+                    "integrity": f"sha256-{digest}",
+                },
+            )
+        else:
+            self._send(
+                200,
+                {
+                    "name": name,
+                    "description": f"Synthetic package {name}",
+                    "homepage": f"https://example.org/{name}",
+                    "licenses": "MIT",
+                    "repo_metadata": {
+                        "license": "mit",
+                        "owner_record": {
+                            "name": "Example Organisation",
+                            "email": "dev@example.org",
+                        },
+                        "tags": [],
+                    },
+                },
+            )
+
+
+class FakeRegistry:
+    """
+    Local HTTP server which responds to package registry requests with an
+    optional latency (in seconds) added to each request.
+    """
+
+    def __init__(self, latency=0.0, unknown_ratio=0.0):
+        self.latency = latency
+        # Proportion of packages which are reported as not found
+        self.unknown_ratio = unknown_ratio
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    def is_unknown(self, name):
+        digest = hashlib.sha256(name.encode()).digest()
+        return digest[0] / 256 < self.unknown_ratio
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+
+    def get_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RegistryHandler)
+        self.server.daemon_threads = True
+        self.server.registry = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def redirect_registry(url):
+    # lib4package uses a fixed URL for the registry. Redirect all requests to
+    # the specified URL. Returns a function to restore the original behaviour.
+    import lib4package.metadata
+
+    original_get = lib4package.metadata.requests.get
+
+    def get(request_url, *args, **kwargs):
+        if request_url.startswith(REGISTRY_URL):
+            request_url = url + request_url[len(REGISTRY_URL) :]
+        return original_get(request_url, *args, **kwargs)
+
+    lib4package.metadata.requests.get = get
+
+    def restore():
+        lib4package.metadata.requests.get = original_get
+
+    return restore
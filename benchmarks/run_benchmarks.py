@@ -0,0 +1,262 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+# Benchmarks for sbom4python using synthetic environments and a local
+# package registry. No network access is required.
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Benchmark the source tree containing this script
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from fake_registry import FakeRegistry, redirect_registry  # noqa: E402
+from synthetic import (  # noqa: E402
+    generate_pylock,
+    generate_requirements,
+    generate_site_packages,
+    generate_uvlock,
+    package_name,
+)
+
+from sbom4python import cli  # noqa: E402
+from sbom4python.distribution import DistributionIndex  # noqa: E402
+from sbom4python.fileanalysis import FileAnalyser  # noqa: E402
+from sbom4python.scanner import SBOMScanner  # noqa: E402
+
+SCENARIOS = ["system", "module", "requirements", "pylock", "uvlock", "cli"]
+
+# Functions for which the number of calls is reported
+COUNTED_FUNCTIONS = [
+    (SBOMScanner, "process_module"),
+    (SBOMScanner, "_retrieve_metadata"),
+    (SBOMScanner, "_create_package"),
+    (SBOMScanner, "_create_relationship"),
+    (SBOMScanner, "analyze_code"),
+    (FileAnalyser, "analyse"),
+]
+
+
+@contextlib.contextmanager
+def count_calls(counts):
+    originals = []
+    for owner, name in COUNTED_FUNCTIONS:
+        original = getattr(owner, name)
+        originals.append((owner, name, original))
+        counts[name] = 0
+
+        def counter(*args, __name=name, __original=original, **kwargs):
+            counts[__name] += 1
+            return __original(*args, **kwargs)
+
+        setattr(owner, name, functools.wraps(original)(counter))
+    try:
+        yield counts
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+class Environment:
+    """
+    Synthetic environment and requirements files for a number of packages.
+    """
+
+    def __init__(self, directory, size, fanout, files, seed):
+        self.size = size
+        self.directory = pathlib.Path(directory) / f"env-{size}"
+        self.site_packages = self.directory / "site-packages"
+        self.requirements = self.directory / "requirements.txt"
+        self.pylock = self.directory / "pylock.toml"
+        self.uvlock = self.directory / "uv.lock"
+        start = time.perf_counter()
+        generate_site_packages(self.site_packages, size, fanout, files, seed)
+        generate_requirements(self.requirements, size, seed)
+        generate_pylock(self.pylock, size, fanout, seed)
+        generate_uvlock(self.uvlock, size, fanout, seed)
+        self.generation_time = time.perf_counter() - start
+
+
+def create_scanner(args, environment=None):
+    scanner = SBOMScanner(
+        False,
+        include_file=args.include_file,
+        include_service=args.include_service,
+        use_record=args.use_record,
+        jobs=args.jobs,
+    )
+    if environment is not None:
+        # Only scan the synthetic environment
+        index = DistributionIndex()
+        index.load(path=[str(environment.site_packages)])
+        scanner.distribution_index = index
+    return scanner
+
+
+def scenario_function(scenario, environment, args, output_directory):
+    if scenario == "system":
+        return lambda: create_scanner(args, environment).process_system()
+    if scenario == "module":
+        return lambda: create_scanner(args, environment).process_python_module(
+            package_name(0)
+        )
+    if scenario in ["requirements", "pylock", "uvlock"]:
+        filename = str(getattr(environment, scenario))
+        return lambda: create_scanner(args).process_requirements(filename)
+
+    # Complete SBOM generation via the command line interface
+    def generate():
+        for sbom, format in [("spdx", "tag"), ("spdx", "json"), ("cyclonedx", "json")]:
+            output_file = output_directory / f"sbom-{environment.size}.{sbom}.{format}"
+            cli.main(
+                [
+                    "sbom4python",
+                    "-r",
+                    str(environment.requirements),
+                    "--sbom",
+                    sbom,
+                    "--format",
+                    format,
+                    "--no-cache",
+                    "-j",
+                    str(args.jobs),
+                    "-o",
+                    str(output_file),
+                ]
+            )
+
+    return generate
+
+
+def measure(function, registry, memory):
+    result = {}
+    counts = {}
+    registry.reset()
+    with count_calls(counts), contextlib.redirect_stdout(io.StringIO()):
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        function()
+        result["wall_time"] = time.perf_counter() - start
+        result["cpu_time"] = time.process_time() - start_cpu
+    result["calls"] = counts
+    result["registry_requests"] = registry.requests
+    if memory:
+        # Separate run as tracing memory allocations affects the timings
+        with contextlib.redirect_stdout(io.StringIO()):
+            tracemalloc.start()
+            function()
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result
+
+
+def main(argv=None):
+    argv = argv or sys.argv
+    parser = argparse.ArgumentParser(
+        description="Benchmarks sbom4python using synthetic environments"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000],
+        help="number of packages in each environment (default: 100 1000)",
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        nargs="+",
+        default=SCENARIOS,
+        help="scenarios to run (default: all)",
+    )
+    parser.add_argument(
+        "--fanout", type=int, default=3, help="dependencies per package (default: 3)"
+    )
+    parser.add_argument(
+        "--files", type=int, default=5, help="modules per package (default: 5)"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="latency in seconds of each registry request (default: 0)",
+    )
+    parser.add_argument(
+        "--unknown",
+        type=float,
+        default=0.0,
+        help="proportion of packages not known to the registry (default: 0)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=4, help="number of jobs (default: 4)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--include-file", action="store_true", help="include file analysis"
+    )
+    parser.add_argument(
+        "--include-service", action="store_true", help="include service analysis"
+    )
+    parser.add_argument(
+        "--use-record", action="store_true", help="use installation record"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="do not measure peak memory"
+    )
+    parser.add_argument("--directory", help="directory for synthetic environments")
+    parser.add_argument("-o", "--output", help="JSON file for results")
+    args = parser.parse_args(argv[1:])
+
+    results = {
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {
+            k: v for k, v in vars(args).items() if k not in ["output", "directory"]
+        },
+        "results": [],
+    }
+    with contextlib.ExitStack() as stack:
+        if args.directory is not None:
+            directory = pathlib.Path(args.directory)
+        else:
+            directory = pathlib.Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        registry = stack.enter_context(FakeRegistry(args.latency, args.unknown))
+        stack.callback(redirect_registry(registry.get_url()))
+        print(f"{'Scenario':<14}{'Size':>7}{'Wall (s)':>10}{'CPU (s)':>10}", end="")
+        print(f"{'Peak (MB)':>11}{'Requests':>10}")
+        for size in args.sizes:
+            environment = Environment(
+                directory, size, args.fanout, args.files, args.seed
+            )
+            for scenario in args.scenario:
+                function = scenario_function(scenario, environment, args, directory)
+                result = measure(function, registry, not args.no_memory)
+                result["scenario"] = scenario
+                result["size"] = size
+                results["results"].append(result)
+                peak = result.get("peak_memory")
+                peak = f"{peak / (1024 * 1024):.1f}" if peak is not None else "-"
+                print(
+                    f"{scenario:<14}{size:>7}{result['wall_time']:>10.2f}"
+                    f"{result['cpu_time']:>10.2f}{peak:>11}"
+                    f"{result['registry_requests']:>10}"
+                )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+# Start up time of the sbom4python command line interface. Each scenario is
+# run in a new interpreter and the modules which are imported are checked to
+# ensure that modules are only imported when the feature requiring them is used.
+
+import argparse
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic import generate_requirements
+
+SOURCE_DIRECTORY = pathlib.Path(__file__).resolve().parent.parent
+
+SCENARIOS = ["version", "help", "requirements", "graph"]
+
+# Modules which should only be imported when required
+DEFERRED_MODULES = {
+    "lib4package": "remote metadata",
+    "sbom4files": "file analysis",
+    "magic": "file analysis",
+    "sbom2dot": "dependency graph",
+    "lib4sbom.generator": "SBOM generation",
+    "sbom4python.scanner": "scanning",
+}
+
+# Deferred modules expected to be imported by each scenario
+EXPECTED_MODULES = {
+    "version": [],
+    "help": [],
+    "requirements": ["lib4sbom.generator", "sbom4python.scanner"],
+    "graph": ["lib4sbom.generator", "sbom4python.scanner", "sbom2dot"],
+}
+
+
+def scenario_arguments(scenario, directory):
+    if scenario in ["version", "help"]:
+        return [f"--{scenario}"]
+    arguments = [
+        "-r",
+        str(directory / "requirements.txt"),
+        "--offline",
+        "--no-cache",
+        "-o",
+        str(directory / "sbom.spdx"),
+    ]
+    if scenario == "graph":
+        arguments += ["-g", str(directory / "sbom.dot")]
+    return arguments
+
+
+def execute(command):
+    # Returns elapsed time and error output of command
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE_DIRECTORY))
+    start = time.perf_counter()
+    result = subprocess.run(command, capture_output=True, text=True, env=environment)
+    return time.perf_counter() - start, result.stderr
+
+
+def run(arguments, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    return execute(command + ["-m", "sbom4python.cli"] + arguments)
+
+
+def imported_modules(arguments):
+    # Modules reported by -X importtime
+    _, output = run(arguments, importtime=True)
+    modules = []
+    for line in output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.split("|")[-1].strip()
+            if name != "imported package":
+                modules.append(name)
+    return modules
+
+
+def deferred_imports(modules):
+    return sorted(
+        module
+        for module in DEFERRED_MODULES
+        if any(m == module or m.startswith(f"{module}.") for m in modules)
+    )
+
+
+def main(argv=None):
+    argv = argv or sys.argv
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the start up time of sbom4python"
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        nargs="+",
+        default=SCENARIOS,
+        help="scenarios to run (default: all)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="number of runs of each scenario (default: 10)",
+    )
+    parser.add_argument(
+        "--packages",
+        type=int,
+        default=10,
+        help="number of packages in requirements file (default: 10)",
+    )
+    parser.add_argument(
+        "--max-time",
+        type=float,
+        default=None,
+        help="maximum median time in seconds of the version scenario",
+    )
+    parser.add_argument("-o", "--output", help="JSON file for results")
+    args = parser.parse_args(argv[1:])
+
+    results = {
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": [],
+    }
+    status = 0
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+        generate_requirements(directory / "requirements.txt", args.packages)
+        # Start up time of the interpreter alone
+        baseline = [
+            execute([sys.executable, "-c", "pass"])[0] for _ in range(args.repeat)
+        ]
+        interpreter = statistics.median(baseline)
+        print(f"{'Scenario':<14}{'Median (s)':>12}{'Min (s)':>10}{'Modules':>9}")
+        print(f"{'interpreter':<14}{interpreter:>12.3f}{min(baseline):>10.3f}")
+        for scenario in args.scenario:
+            arguments = scenario_arguments(scenario, directory)
+            times = [run(arguments)[0] for _ in range(args.repeat)]
+            modules = imported_modules(arguments)
+            deferred = deferred_imports(modules)
+            result = {
+                "scenario": scenario,
+                "median_time": statistics.median(times),
+                "min_time": min(times),
+                "modules": len(modules),
+                "deferred_modules": deferred,
+            }
+            results["results"].append(result)
+            print(
+                f"{scenario:<14}{result['median_time']:>12.3f}"
+                f"{result['min_time']:>10.3f}{len(modules):>9}"
+            )
+            unexpected = [m for m in deferred if m not in EXPECTED_MODULES[scenario]]
+            for module in unexpected:
+                print(
+                    f"[ERROR] {module} imported by {scenario} scenario but only "
+                    f"required for {DEFERRED_MODULES[module]}"
+                )
+                status = 1
+            if (
+                scenario == "version"
+                and args.max_time is not None
+                and result["median_time"] > args.max_time
+            ):
+                print(
+                    f"[ERROR] Start up time {result['median_time']:.3f}s exceeds "
+                    f"{args.max_time}s"
+                )
+                status = 1
+    results["interpreter_time"] = interpreter
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+# Generators for synthetic Python environments and requirements files.
+# All content is derived from a seed so that environments are reproducible.
+
+import base64
+import hashlib
+import pathlib
+import random
+
+LICENSES = ["MIT", "BSD", "Apache 2.0", "Apache-2.0", "GPLv3", "MPL-2.0", "ISC"]
+AUTHORS = [
+    ("Jane Doe", "jane@example.org"),
+    ("John Smith", "john.smith@example.com"),
+    ("Example Organisation Developers", "dev@example.net"),
+    ("Ana Lopez", "ana@example.es"),
+]
+
+
+def package_name(index):
+    return f"synth-pkg-{index:05d}"
+
+
+def package_version(index):
+    return f"{1 + index % 7}.{index % 13}.{index % 5}"
+
+
+def dependencies(index, count, fanout, rng):
+    # Dependencies are only on packages with a higher index so that the
+    # dependency graph is acyclic
+    candidates = range(index + 1, count)
+    return sorted(rng.sample(candidates, min(fanout, len(candidates))))
+
+
+def _record_entry(path, content):
+    digest = base64.urlsafe_b64encode(hashlib.sha256(content).digest())
+    return f"{path},sha256={digest.decode().rstrip('=')},{len(content)}"
+
+
+def _write(directory, relative, content, record):
+    filename = directory / relative
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    filename.write_bytes(content)
+    record.append(_record_entry(relative, content))
+
+
+def _source_file(name, number, service):
+    lines = [f'"""Module {number} of {name}."""', "", "import os", ""]
+    if service:
+        lines += [
+            "import requests",
+            "",
+            f'ENDPOINT = "https://api.example.org/{name}/{number}"',
+            "",
+            "",
+            "def fetch():",
+            "    return requests.get(ENDPOINT)",
+        ]
+    for function in range(10):
+        lines += [
+            "",
+            "",
+            f"def function_{function}(value):",
+            f"    return os.path.join(str(value), '{name}', '{function}')",
+        ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def generate_site_packages(
+    directory, count, fanout=3, files=5, seed=0, service_ratio=0.1
+):
+    """Creates count distributions (.dist-info) in directory.
+
+    Returns a dictionary of package name to list of dependencies."""
+    rng = random.Random(seed)
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    graph = {}
+    for index in range(count):
+        name = package_name(index)
+        version = package_version(index)
+        requires = [package_name(d) for d in dependencies(index, count, fanout, rng)]
+        graph[name] = requires
+        module = name.replace("-", "_")
+        dist_info = f"{module}-{version}.dist-info"
+        license = rng.choice(LICENSES)
+        author, email = rng.choice(AUTHORS)
+        metadata = [
+            "Metadata-Version: 2.1",
+            f"Name: {name}",
+            f"Version: {version}",
+            f"Summary: Synthetic package {index}",
+            f"Home-page: https://example.org/{name}",
+            f"Author: {author}",
+            f"Author-email: {email}",
+            f"License: {license}",
+            f"Project-URL: Source, https://github.com/example/{name}",
+            f"Project-URL: Bug Tracker, https://github.com/example/{name}/issues",
+            "Classifier: Programming Language :: Python :: 3",
+        ]
+        metadata += [f"Requires-Dist: {r}" for r in requires]
+        # Include optional dependencies which should not be followed
+        metadata.append('Requires-Dist: pytest ; extra == "test"')
+        record = []
+        _write(directory, f"{module}/__init__.py", b"", record)
+        for number in range(files):
+            _write(
+                directory,
+                f"{module}/module_{number}.py",
+                _source_file(name, number, rng.random() < service_ratio),
+                record,
+            )
+        _write(
+            directory,
+            f"{dist_info}/METADATA",
+            ("\n".join(metadata) + "\n").encode(),
+            record,
+        )
+        _write(directory, f"{dist_info}/top_level.txt", f"{module}\n".encode(), record)
+        record.append(f"{dist_info}/RECORD,,")
+        (directory / dist_info / "RECORD").write_text("\n".join(record) + "\n")
+    return graph
+
+
+def generate_requirements(filename, count, seed=0):
+    rng = random.Random(seed)
+    lines = ["# Synthetic requirements file"]
+    for index in range(count):
+        name = package_name(index)
+        choice = rng.random()
+        if choice < 0.6:
+            lines.append(f"{name}=={package_version(index)}")
+        elif choice < 0.8:
+            lines.append(f"{name}>={package_version(index)}")
+        elif choice < 0.9:
+            lines.append(f'{name}=={package_version(index)} ; python_version >= "3.8"')
+        else:
+            lines.append(f"{name}  # unpinned")
+    pathlib.Path(filename).write_text("\n".join(lines) + "\n")
+
+
+def _hash(name, version, kind):
+    return hashlib.sha256(f"{name}-{version}-{kind}".encode()).hexdigest()
+
+
+def generate_pylock(filename, count, fanout=3, seed=0):
+    rng = random.Random(seed)
+    lines = ['lock-version = "1.0"', 'created-by = "sbom4python-benchmark"', ""]
+    for index in range(count):
+        name = package_name(index)
+        version = package_version(index)
+        module = name.replace("-", "_")
+        lines += [
+            "[[packages]]",
+            f'name = "{name}"',
+            f'version = "{version}"',
+            'index = "https://pypi.org/simple"',
+        ]
+        requires = dependencies(index, count, fanout, rng)
+        if len(requires) > 0:
+            entries = ", ".join(f'{{ name = "{package_name(d)}" }}' for d in requires)
+            lines.append(f"dependencies = [{entries}]")
+        lines += [
+            "",
+            "[[packages.wheels]]",
+            f'name = "{module}-{version}-py3-none-any.whl"',
+            f'url = "https://files.example.org/{module}-{version}-py3-none-any.whl"',
+            f'hashes = {{ sha256 = "{_hash(name, version, "wheel")}" }}',
+            "",
+        ]
+    pathlib.Path(filename).write_text("\n".join(lines))
+
+
+def generate_uvlock(filename, count, fanout=3, seed=0):
+    rng = random.Random(seed)
+    lines = ["version = 1", 'requires-python = ">=3.8"', ""]
+    for index in range(count):
+        name = package_name(index)
+        version = package_version(index)
+        module = name.replace("-", "_")
+        lines += [
+            "[[package]]",
+            f'name = "{name}"',
+            f'version = "{version}"',
+            'source = { registry = "https://pypi.org/simple" }',
+        ]
+        requires = dependencies(index, count, fanout, rng)
+        if len(requires) > 0:
+            entries = ", ".join(f'{{ name = "{package_name(d)}" }}' for d in requires)
+            lines.append(f"dependencies = [{entries}]")
+        lines += [
+            (
+                f'sdist = {{ url = "https://files.example.org/{name}-{version}'
+                '.tar.gz", '
+                f'hash = "sha256:{_hash(name, version, "sdist")}", size = 1024 }}'
+            ),
+            "wheels = [",
+            (
+                f'    {{ url = "https://files.example.org/{module}-{version}'
+                f'-py3-none-any.whl", hash = "sha256:{_hash(name, version, "wheel")}", '
+                "size = 2048 },"
+            ),
+            "]",
+            "",
+        ]
+    pathlib.Path(filename).write_text("\n".join(lines))
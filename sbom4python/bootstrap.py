@@ -0,0 +1,87 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+# Executed by the Python interpreter of the environment being scanned to
+# report the metadata of all of the installed distributions as a single
+# JSON document. Only the standard library may be used.
+
+import json
+import os
+import platform
+import sys
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    import importlib_metadata
+
+ATTRIBUTES = [
+    "Name",
+    "Version",
+    "Summary",
+    "Home-page",
+    "Author",
+    "Author-email",
+    "License",
+    "License-Expression",
+    "Download-URL",
+]
+MULTIPLE_ATTRIBUTES = ["Project-URL", "Requires-Dist", "Classifier"]
+
+
+def marker_environment():
+    # Values of environment markers (PEP 508) as reported by pip inspect
+    version = sys.implementation.version
+    implementation_version = "{0.major}.{0.minor}.{0.micro}".format(version)
+    if version.releaselevel != "final":
+        implementation_version += version.releaselevel[0] + str(version.serial)
+    return {
+        "implementation_name": sys.implementation.name,
+        "implementation_version": implementation_version,
+        "os_name": os.name,
+        "platform_machine": platform.machine(),
+        "platform_release": platform.release(),
+        "platform_system": platform.system(),
+        "platform_version": platform.version(),
+        "python_full_version": platform.python_version(),
+        "platform_python_implementation": platform.python_implementation(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    }
+
+
+def main():
+    installed = []
+    for distribution in importlib_metadata.distributions():
+        package_data = distribution.metadata
+        if package_data is None or len(package_data) == 0:
+            continue
+        # Metadata is reported in JSON format as defined by PEP 566
+        metadata = {}
+        for attribute in ATTRIBUTES:
+            if package_data.get(attribute) is not None:
+                metadata[attribute.lower().replace("-", "_")] = package_data[attribute]
+        for attribute in MULTIPLE_ATTRIBUTES:
+            values = package_data.get_all(attribute)
+            if values:
+                metadata[attribute.lower().replace("-", "_")] = values
+        installed.append(
+            {
+                "metadata": metadata,
+                "location": str(distribution.locate_file("")),
+                # Location of the .dist-info directory (if known)
+                "metadata_location": str(getattr(distribution, "_path", "")) or None,
+            }
+        )
+    json.dump(
+        {
+            "python_version": platform.python_version(),
+            "environment": marker_environment(),
+            "installed": installed,
+        },
+        sys.stdout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+
+from sbom4python.normalise import normalise_name
+
+DEFAULT_CACHE_DIR = "~/.cache/sbom4python"
+# Time to live for cached metadata (in days)
+DEFAULT_CACHE_TTL = 7
+
+
+def _file_key(filename):
+    # Returns None if file is not available
+    try:
+        status = os.stat(filename)
+    except OSError:
+        return None
+    return (
+        os.path.abspath(filename),
+        status.st_size,
+        status.st_mtime_ns,
+        status.st_ino,
+    )
+
+
+class SBOMCache:
+    """
+    Persistent cache stored in a SQLite database.
+    """
+
+    def __init__(self, cache_dir, database, table, schema, debug=False):
+        self.debug = debug
+        self.cache_dir = pathlib.Path(cache_dir).expanduser()
+        self.table = table
+        self.lock = threading.Lock()
+        self.connection = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(
+                str(self.cache_dir / database), check_same_thread=False
+            )
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} {schema}")
+            self.connection.commit()
+        except (OSError, sqlite3.Error) as ex:
+            if self.debug:
+                print(f"[ERROR] Unable to use cache in {self.cache_dir} - {ex}")
+            self.connection = None
+
+    def clear(self):
+        if self.connection is None:
+            return
+        with self.lock:
+            self.connection.execute(f"DELETE FROM {self.table}")
+            self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class MetadataCache(SBOMCache):
+    """
+    Persistent cache of package metadata retrieved from the package registry.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL, debug=False):
+        super().__init__(
+            cache_dir,
+            "metadata.db",
+            "metadata",
+            "(name TEXT, version TEXT, timestamp REAL, data TEXT, "
+            "PRIMARY KEY (name, version))",
+            debug=debug,
+        )
+        # TTL is specified in days
+        self.ttl = ttl * 24 * 60 * 60
+
+    def _version(self, version):
+        return version if version is not None else ""
+
+    def get(self, name, version):
+        if self.connection is None:
+            return None
+        with self.lock:
+            entry = self.connection.execute(
+                "SELECT timestamp, data FROM metadata WHERE name = ? AND version = ?",
+                (normalise_name(name), self._version(version)),
+            ).fetchone()
+        if entry is None:
+            return None
+        timestamp, data = entry
+        if time.time() - timestamp > self.ttl:
+            if self.debug:
+                print(f"Cached metadata for {name} {version} has expired")
+            return None
+        return json.loads(data)
+
+    def set(self, name, version, metadata):
+        self.store([((name, version), metadata)])
+
+    def store(self, entries):
+        # Store multiple ((name, version), metadata) entries in one transaction
+        if self.connection is None:
+            return
+        timestamp = time.time()
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        normalise_name(name),
+                        self._version(version),
+                        timestamp,
+                        json.dumps(metadata),
+                    )
+                    for (name, version), metadata in entries
+                ],
+            )
+            self.connection.commit()
+
+
+class FileCache(SBOMCache):
+    """
+    Persistent cache of file analysis. A file is assumed to be unchanged if
+    its size, modification time and inode are unchanged.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, debug=False):
+        super().__init__(
+            cache_dir,
+            "files.db",
+            "files",
+            "(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, inode INTEGER, "
+            "data TEXT)",
+            debug=debug,
+        )
+
+    def get(self, filename):
+        if self.connection is None:
+            return None
+        key = _file_key(filename)
+        if key is None:
+            return None
+        with self.lock:
+            entry = self.connection.execute(
+                "SELECT data FROM files "
+                "WHERE path = ? AND size = ? AND mtime = ? AND inode = ?",
+                key,
+            ).fetchone()
+        if entry is None:
+            return None
+        return json.loads(entry[0])
+
+    def store(self, entries):
+        # Store multiple (filename, file analysis) entries in one transaction
+        if self.connection is None:
+            return
+        records = []
+        for filename, file_info in entries:
+            key = _file_key(filename)
+            if key is not None:
+                records.append(key + (json.dumps(file_info),))
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", records
+            )
+            self.connection.commit()
+
+
+class MemoryMetadataCache:
+    """
+    Cache of package metadata held in memory for the lifetime of the process
+    (e.g. when running as a server). Metadata not held in memory is
+    retrieved from an optional persistent cache.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, cache=None):
+        # TTL is specified in days
+        self.ttl = ttl * 24 * 60 * 60
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def _key(self, name, version):
+        return (normalise_name(name), version if version is not None else "")
+
+    def get(self, name, version):
+        key = self._key(name, version)
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None and time.time() - entry[0] <= self.ttl:
+            return entry[1]
+        if self.cache is None:
+            return None
+        metadata = self.cache.get(name, version)
+        if metadata is not None:
+            with self.lock:
+                self.entries[key] = (time.time(), metadata)
+        return metadata
+
+    def set(self, name, version, metadata):
+        self.store([((name, version), metadata)])
+
+    def store(self, entries):
+        entries = list(entries)
+        timestamp = time.time()
+        with self.lock:
+            for (name, version), metadata in entries:
+                self.entries[self._key(name, version)] = (timestamp, metadata)
+        if self.cache is not None:
+            self.cache.store(entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+        if self.cache is not None:
+            self.cache.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class MemoryFileCache:
+    """
+    Cache of file analysis held in memory for the lifetime of the process.
+    Analysis not held in memory is retrieved from an optional persistent
+    cache. A file is assumed to be unchanged if its size, modification time
+    and inode are unchanged.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, filename):
+        key = _file_key(filename)
+        if key is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(key[0])
+        if entry is not None and entry[0] == key:
+            # Analysis is updated by the caller
+            return dict(entry[1])
+        if self.cache is None:
+            return None
+        file_info = self.cache.get(filename)
+        if file_info is not None:
+            with self.lock:
+                self.entries[key[0]] = (key, dict(file_info))
+        return file_info
+
+    def store(self, entries):
+        entries = list(entries)
+        with self.lock:
+            for filename, file_info in entries:
+                key = _file_key(filename)
+                if key is not None:
+                    self.entries[key[0]] = (key, dict(file_info))
+        if self.cache is not None:
+            self.cache.store(entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+        if self.cache is not None:
+            self.cache.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -2,24 +2,35 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
+import os
+import pathlib
 import sys
 import textwrap
 from collections import ChainMap
 
-from lib4sbom.generator import SBOMGenerator
-from lib4sbom.output import SBOMOutput
-from lib4sbom.sbom import SBOM
-from sbom2dot.dotgenerator import DOTGenerator
-
-from sbom4python.scanner import SBOMScanner
+from sbom4python.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_TTL,
+    FileCache,
+    MetadataCache,
+)
+from sbom4python.metrics import Metrics
 from sbom4python.version import VERSION
 
+# Modules required for scanning and generating the SBOM are only imported
+# when used to minimise the start up time
+
 # CLI processing
 
 
 def main(argv=None):
 
     argv = argv or sys.argv
+    if len(argv) > 1 and argv[1] == "serve":
+        # Run as a service
+        from sbom4python.server import main as serve
+
+        return serve(argv[1:])
     app_name = "sbom4python"
     parser = argparse.ArgumentParser(
         prog=app_name,
@@ -36,22 +47,38 @@ def main(argv=None):
     input_group.add_argument(
         "-m",
         "--module",
-        action="store",
-        default="",
-        help="identity of python module",
+        action="append",
+        default=[],
+        help="identity of python module (may include wildcards). "
+        "Can be specified multiple times",
     )
     input_group.add_argument(
         "-r",
         "--requirement",
-        action="store",
-        default="",
-        help="name of requirements file",
+        action="append",
+        default=[],
+        help="name of requirements file (may include wildcards). "
+        "Can be specified multiple times",
+    )
+    input_group.add_argument(
+        "--extra",
+        action="append",
+        default=[],
+        help="include optional dependencies of extra of module or project. "
+        "Can be specified multiple times",
     )
     input_group.add_argument(
         "--system",
         action="store_true",
         help="include all installed python modules within system",
     )
+    input_group.add_argument(
+        "--environment",
+        action="append",
+        nargs="+",
+        help="python interpreter or directory of installed python modules "
+        "(e.g. site-packages) of environment to scan. Can be specified multiple times",
+    )
     input_group.add_argument(
         "--exclude-license",
         action="store_true",
@@ -63,6 +90,12 @@ def main(argv=None):
         default=False,
         help="include reporting files associated with module",
     )
+    input_group.add_argument(
+        "--use-record",
+        action="store_true",
+        default=False,
+        help="use installation record to identify files associated with module",
+    )
     input_group.add_argument(
         "--include-service",
         action="store_true",
@@ -78,7 +111,70 @@ def main(argv=None):
     input_group.add_argument(
         "--python",
         action="store",
-        help="use specified Python interpreter for pip",
+        help="use specified Python interpreter",
+    )
+    input_group.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=4,
+        help="number of concurrent package metadata lookups, file analysis "
+        "processes and environment scans (default: 4)",
+    )
+    input_group.add_argument(
+        "--cache-dir",
+        action="store",
+        default=DEFAULT_CACHE_DIR,
+        help=f"directory for cache (default: {DEFAULT_CACHE_DIR})",
+    )
+    input_group.add_argument(
+        "--cache-ttl",
+        action="store",
+        type=int,
+        default=DEFAULT_CACHE_TTL,
+        help=f"days to cache package metadata (default: {DEFAULT_CACHE_TTL})",
+    )
+    input_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="do not cache package metadata or file analysis",
+    )
+    input_group.add_argument(
+        "--clear-cache",
+        action="store_true",
+        default=False,
+        help="clear cache",
+    )
+    input_group.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="do not retrieve package metadata from the package registry",
+    )
+    input_group.add_argument(
+        "--max-failures",
+        action="store",
+        type=int,
+        default=10,
+        help="number of consecutive failures to retrieve package metadata before "
+        "operating offline (default: 10)",
+    )
+    input_group.add_argument(
+        "--network-budget",
+        action="store",
+        type=float,
+        help="maximum time (in seconds) spent retrieving package metadata before "
+        "operating offline",
+    )
+    input_group.add_argument(
+        "--incremental",
+        action="store",
+        default="",
+        metavar="PREVIOUS_SBOM",
+        help="only analyse distributions which have changed since previous SBOM "
+        "was generated",
     )
 
     output_group = parser.add_argument_group("Output")
@@ -104,6 +200,18 @@ def main(argv=None):
         help="specify format of software bill of materials (sbom) (default: tag)",
     )
 
+    output_group.add_argument(
+        "--merge",
+        action="store_true",
+        default=False,
+        help="generate a single SBOM for all environments",
+    )
+    output_group.add_argument(
+        "--stream",
+        action="store_true",
+        default=False,
+        help="write SBOM as components are identified to reduce memory usage",
+    )
     output_group.add_argument(
         "-o",
         "--output-file",
@@ -119,32 +227,66 @@ def main(argv=None):
         default="",
         help="filename for dependency graph",
     )
+    output_group.add_argument(
+        "--timings",
+        action="store_true",
+        default=False,
+        help="report timings and counters of processing to stderr",
+    )
+    output_group.add_argument(
+        "--metrics-file",
+        action="store",
+        default="",
+        help="filename for timings and counters of processing (JSON format)",
+    )
 
     parser.add_argument("-V", "--version", action="version", version=VERSION)
 
     defaults = {
-        "module": "",
-        "requirement": "",
+        "module": [],
+        "requirement": [],
+        "extra": [],
         "include_file": False,
         "include_service": False,
+        "use_record": False,
         "exclude_license": False,
         "use_pip": False,
         "system": False,
+        "environment": [],
+        "merge": False,
         "output_file": "",
         "sbom": "spdx",
         "debug": False,
         "format": "tag",
         "graph": "",
         "python": "",
+        "jobs": 4,
+        "cache_dir": DEFAULT_CACHE_DIR,
+        "cache_ttl": DEFAULT_CACHE_TTL,
+        "no_cache": False,
+        "clear_cache": False,
+        "offline": False,
+        "max_failures": 10,
+        "network_budget": None,
+        "incremental": "",
+        "stream": False,
+        "timings": False,
+        "metrics_file": "",
     }
 
     raw_args = parser.parse_args(argv[1:])
-    args = {key: value for key, value in vars(raw_args).items() if value}
+    # Options which are not specified are None. Zero is a valid value
+    args = {key: value for key, value in vars(raw_args).items() if value is not None}
     args = ChainMap(args, defaults)
 
     # Validate CLI parameters
 
-    module_name = args["module"]
+    modules = args["module"]
+    requirements = args["requirement"]
+    environments = [e for group in args["environment"] for e in group]
+    if len(modules) > 0 or args["system"] or len(requirements) > 0:
+        # Environments have the lowest priority
+        environments = []
 
     # Ensure format is aligned with type of SBOM
     bom_format = args["format"]
@@ -154,38 +296,249 @@ def main(argv=None):
             bom_format = "json"
 
     if args["debug"]:
+        print("Extras:", args["extra"])
         print("Exclude Licences:", args["exclude_license"])
         print("Include Files:", args["include_file"])
+        print("Use Record:", args["use_record"])
         print("Include Services:", args["include_service"])
         print("Use Pip:", args["use_pip"])
-        print("Module", module_name)
-        print("Requirements file", args["requirement"])
+        print("Jobs:", args["jobs"])
+        print("Cache directory:", args["cache_dir"])
+        print("Cache TTL:", args["cache_ttl"])
+        print("No cache:", args["no_cache"])
+        print("Clear cache:", args["clear_cache"])
+        print("Offline:", args["offline"])
+        print("Maximum failures:", args["max_failures"])
+        print("Network budget:", args["network_budget"])
+        print("Incremental:", args["incremental"])
+        print("Modules", modules)
+        print("Requirements files", requirements)
         print("System", args["system"])
+        print("Environments", environments)
+        print("Merge:", args["merge"])
         print("SBOM type:", args["sbom"])
         print("Format:", bom_format)
+        print("Stream:", args["stream"])
         print("Output file:", args["output_file"])
         print("Graph file:", args["graph"])
-        print(f"Analysing {module_name}")
-
-    sbom_scan = SBOMScanner(
-        args["debug"],
-        args["include_file"],
-        args["exclude_license"],
-        include_service=args["include_service"],
-        use_pip=args["use_pip"],
-        python_path=args["python"],
-    )
-
-    if len(module_name) > 0:
-        sbom_scan.process_python_module(module_name)
-    elif args["system"]:
-        sbom_scan.process_system()
-    elif len(args["requirement"]) > 0:
-        sbom_scan.process_requirements(args["requirement"])
-    else:
-        print("[ERROR] Nothing to process")
+        print("Timings:", args["timings"])
+        print("Metrics file:", args["metrics_file"])
+        print(f"Analysing {', '.join(modules + requirements)}")
+
+    # Interpreters of the environments to be scanned must be available
+    interpreters = [
+        e for e in environments if not pathlib.Path(e).expanduser().is_dir()
+    ]
+    if len(args["python"]) > 0:
+        interpreters.append(args["python"])
+    for interpreter in interpreters:
+        interpreter_path = pathlib.Path(interpreter).expanduser()
+        if not interpreter_path.is_file() or not os.access(interpreter_path, os.X_OK):
+            print(f"[ERROR] Python interpreter {interpreter} not found")
+            return -1
+
+    if args["stream"]:
+        if bom_format == "yaml":
+            print("[ERROR] Streaming is not supported for YAML format")
+            return -1
+        if len(args["graph"]) > 0:
+            print("[ERROR] Streaming is not supported with a dependency graph")
+            return -1
+
+    if len(args["incremental"]) > 0 and len(args["output_file"]) == 0:
+        print("[ERROR] Incremental scan requires an output file")
         return -1
 
+    if len(environments) > 0:
+        if args["merge"]:
+            if args["stream"]:
+                print("[ERROR] Streaming is not supported for a merged SBOM")
+                return -1
+            if len(args["incremental"]) > 0:
+                print("[ERROR] Incremental scan is not supported for a merged SBOM")
+                return -1
+        elif len(args["output_file"]) == 0:
+            print("[ERROR] Output file required for the SBOM of each environment")
+            return -1
+
+    metadata_cache = None
+    file_cache = None
+    if args["clear_cache"] or not args["no_cache"]:
+        metadata_cache = MetadataCache(
+            args["cache_dir"], args["cache_ttl"], debug=args["debug"]
+        )
+        if args["clear_cache"] or args["include_file"]:
+            file_cache = FileCache(args["cache_dir"], debug=args["debug"])
+    if args["clear_cache"]:
+        metadata_cache.clear()
+        file_cache.clear()
+        if (
+            len(modules) == 0
+            and not args["system"]
+            and len(requirements) == 0
+            and len(environments) == 0
+        ):
+            # Nothing else to process
+            return 0
+    if args["no_cache"]:
+        metadata_cache = None
+        file_cache = None
+
+    metrics = Metrics()
+    scanner_options = {
+        "include_file": args["include_file"],
+        "exclude_license": args["exclude_license"],
+        "include_service": args["include_service"],
+        "use_pip": args["use_pip"],
+        "use_record": args["use_record"],
+        "cache": metadata_cache,
+        "file_cache": file_cache,
+        "offline": args["offline"],
+        "max_failures": args["max_failures"],
+        "network_budget": args["network_budget"],
+        "extras": args["extra"],
+    }
+    if len(environments) > 0:
+        from sbom4python.environments import EnvironmentScanner
+
+        sbom_scan = EnvironmentScanner(
+            environments,
+            debug=args["debug"],
+            jobs=args["jobs"],
+            metrics=metrics,
+            **scanner_options,
+        )
+    else:
+        from sbom4python.scanner import SBOMScanner
+
+        sbom_scan = SBOMScanner(
+            args["debug"],
+            python_path=args["python"],
+            jobs=args["jobs"],
+            metrics=metrics,
+            **scanner_options,
+        )
+
+    # SBOM (scanner, output file, graph file, previous SBOM) to be generated
+    if len(environments) > 0 and not args["merge"]:
+        from sbom4python.environments import environment_filename
+
+        outputs = [
+            (
+                scanner,
+                environment_filename(args["output_file"], environment),
+                environment_filename(args["graph"], environment),
+                environment_filename(args["incremental"], environment),
+            )
+            for environment, scanner in sbom_scan.get_scanners()
+        ]
+    else:
+        outputs = [(sbom_scan, args["output_file"], args["graph"], args["incremental"])]
+
+    sbom_writers = []
+    scan_states = []
+    for scanner, output_file, _, previous_sbom in outputs:
+        sbom_writer = None
+        if args["stream"]:
+            from sbom4python.writer import SBOMWriter
+
+            sbom_writer = SBOMWriter(
+                sbom_type=args["sbom"],
+                format=bom_format,
+                filename=output_file,
+                application=app_name,
+                version=VERSION,
+                debug=args["debug"],
+            )
+            scanner.set_writer(sbom_writer)
+        sbom_writers.append(sbom_writer)
+        scan_state = None
+        if len(previous_sbom) > 0:
+            from sbom4python.state import ScanState
+
+            # State is only reused if the same options are specified
+            scan_state = ScanState(
+                {
+                    "include_file": args["include_file"],
+                    "use_record": args["use_record"],
+                    "use_pip": args["use_pip"],
+                    "python": args["python"],
+                },
+                debug=args["debug"],
+            )
+            scan_state.load(previous_sbom)
+            scanner.set_state(scan_state)
+        scan_states.append(scan_state)
+
+    with metrics.phase("scan"):
+        if len(modules) > 0:
+            sbom_scan.process_inputs(modules, requirements)
+        elif args["system"]:
+            sbom_scan.process_system()
+        elif len(requirements) > 0:
+            sbom_scan.process_inputs([], requirements)
+        elif len(environments) > 0:
+            sbom_scan.process_environments()
+        else:
+            print("[ERROR] Nothing to process")
+            return -1
+    sbom_scan.close()
+
+    if sbom_scan.network_disabled():
+        print(
+            "[WARNING] Package registry unavailable. Metadata not retrieved for "
+            f"{sbom_scan.get_unenriched()} packages",
+            file=sys.stderr,
+        )
+
+    if args["debug"]:
+        for name, info in sbom_scan.get_cache_info().items():
+            print(
+                f"{name.capitalize()} cache: {info['hits']} hits, "
+                f"{info['misses']} misses ({info['hit_rate']:.1%})"
+            )
+
+    for (scanner, output_file, graph_file, _), sbom_writer, scan_state in zip(
+        outputs, sbom_writers, scan_states
+    ):
+        _generate_sbom(
+            args,
+            app_name,
+            bom_format,
+            scanner,
+            output_file,
+            graph_file,
+            metrics,
+            sbom_writer,
+            scan_state,
+        )
+
+    _report_metrics(args, sbom_scan, metrics)
+    return 0
+
+
+def _generate_sbom(
+    args,
+    app_name,
+    bom_format,
+    sbom_scan,
+    output_file,
+    graph_file,
+    metrics,
+    sbom_writer=None,
+    scan_state=None,
+):
+    if sbom_writer is not None:
+        # Only the document remains to be generated
+        with metrics.phase("generation"):
+            sbom_writer.close(sbom_scan.get_parent(), sbom_scan.get_document())
+        if scan_state is not None:
+            scan_state.save(output_file)
+        return
+
+    from lib4sbom.generator import SBOMGenerator
+    from lib4sbom.sbom import SBOM
+
     # Generate SBOM file
     python_sbom = SBOM()
     python_sbom.add_document(sbom_scan.get_document())
@@ -196,19 +549,33 @@ def main(argv=None):
     sbom_gen = SBOMGenerator(
         sbom_type=args["sbom"], format=bom_format, application=app_name, version=VERSION
     )
-    sbom_gen.generate(
-        project_name=sbom_scan.get_parent(),
-        sbom_data=python_sbom.get_sbom(),
-        filename=args["output_file"],
-    )
+    with metrics.phase("generation"):
+        sbom_gen.generate(
+            project_name=sbom_scan.get_parent(),
+            sbom_data=python_sbom.get_sbom(),
+            filename=output_file,
+        )
 
-    if len(args["graph"]) > 0:
-        sbom_dot = DOTGenerator(python_sbom.get_sbom()["packages"])
-        sbom_dot.generatedot(python_sbom.get_sbom()["relationships"])
-        dot_out = SBOMOutput(args["graph"], "dot")
-        dot_out.generate_output(sbom_dot.getDOT())
+    if len(graph_file) > 0:
+        from lib4sbom.output import SBOMOutput
+        from sbom2dot.dotgenerator import DOTGenerator
 
-    return 0
+        with metrics.phase("graph"):
+            sbom_dot = DOTGenerator(python_sbom.get_sbom()["packages"])
+            sbom_dot.generatedot(python_sbom.get_sbom()["relationships"])
+            dot_out = SBOMOutput(graph_file, "dot")
+            dot_out.generate_output(sbom_dot.getDOT())
+
+    if scan_state is not None:
+        scan_state.save(output_file)
+
+
+def _report_metrics(args, sbom_scan, metrics):
+    sbom_scan.get_metrics()
+    if args["timings"]:
+        metrics.report(file=sys.stderr)
+    if len(args["metrics_file"]) > 0:
+        metrics.write(args["metrics_file"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import pathlib
+import sys
+
+if sys.version_info >= (3, 10):
+    from importlib import metadata as importlib_metadata
+else:
+    import importlib_metadata
+
+from sbom4python.normalise import normalise_name
+
+
+class DistributionIndex:
+    """
+    Index of installed Python distributions keyed on normalised name.
+    """
+
+    # Subset of metadata retained for each distribution
+    ATTRIBUTES = [
+        "Name",
+        "Version",
+        "Summary",
+        "Home-page",
+        "Author",
+        "Author-email",
+        "License",
+        "License-Expression",
+        "Download-URL",
+    ]
+    # Metadata which may be specified multiple times
+    MULTIPLE_ATTRIBUTES = ["Project-URL", "Requires-Dist", "Classifier"]
+
+    def __init__(self, debug=False):
+        self.debug = debug
+        self.distributions = {}
+        # Distribution objects for distributions loaded from this interpreter
+        self.installed = {}
+        # Environment markers (PEP 508) of the interpreter if not the current
+        # interpreter
+        self.environment = None
+
+    def add(self, metadata):
+        # The first distribution found takes precedence (same as importlib)
+        name = metadata.get("Name")
+        if name is None or len(name) == 0:
+            return False
+        key = normalise_name(name)
+        if key in self.distributions:
+            return False
+        self.distributions[key] = metadata
+        return True
+
+    def add_json(self, json_metadata, location=None, metadata_location=None):
+        # Metadata in JSON format as defined by PEP 566
+        metadata = {}
+        for attribute in self.ATTRIBUTES + self.MULTIPLE_ATTRIBUTES:
+            value = json_metadata.get(attribute.lower().replace("-", "_"))
+            if value:
+                metadata[attribute] = value
+        if location is not None:
+            metadata["Location"] = location
+        if metadata_location is not None:
+            metadata["Metadata-Location"] = metadata_location
+        self.add(metadata)
+
+    def load(self, path=None):
+        if path is None:
+            installed_distributions = importlib_metadata.distributions()
+        else:
+            installed_distributions = importlib_metadata.distributions(path=path)
+        for distribution in installed_distributions:
+            package_data = distribution.metadata
+            if package_data is None or len(package_data) == 0:
+                continue
+            metadata = {}
+            for attribute in self.ATTRIBUTES:
+                if package_data.get(attribute) is not None:
+                    metadata[attribute] = package_data[attribute]
+            for attribute in self.MULTIPLE_ATTRIBUTES:
+                values = package_data.get_all(attribute)
+                if values:
+                    metadata[attribute] = values
+            metadata["Location"] = str(distribution.locate_file(""))
+            if self.add(metadata):
+                self.installed[normalise_name(metadata["Name"])] = distribution
+        if self.debug:
+            print(f"{len(self.distributions)} distributions indexed")
+
+    def get(self, name):
+        return self.distributions.get(normalise_name(name))
+
+    def get_distribution(self, name):
+        # Distribution object is required to access the files of a distribution
+        key = normalise_name(name)
+        if key in self.installed:
+            return self.installed[key]
+        metadata = self.distributions.get(key)
+        if metadata is not None and metadata.get("Metadata-Location") is not None:
+            return importlib_metadata.Distribution.at(metadata["Metadata-Location"])
+        return None
+
+    def _metadata_path(self, key):
+        if key in self.installed:
+            path = getattr(self.installed[key], "_path", None)
+            return pathlib.Path(path) if path is not None else None
+        metadata = self.distributions.get(key)
+        if metadata is not None and metadata.get("Metadata-Location") is not None:
+            return pathlib.Path(metadata["Metadata-Location"])
+        return None
+
+    def get_fingerprint(self, name):
+        # Fingerprint of an installed distribution based on the location,
+        # modification time and installation record of the metadata.
+        # None if the metadata can not be located
+        path = self._metadata_path(normalise_name(name))
+        if path is None:
+            return None
+        fingerprint = hashlib.sha256(str(path.resolve()).encode())
+        for filename in [path, path / "RECORD", path / "METADATA", path / "PKG-INFO"]:
+            try:
+                status = filename.stat()
+                fingerprint.update(
+                    f"{filename.name}:{status.st_size}:{status.st_mtime_ns}".encode()
+                )
+                if filename.name == "RECORD":
+                    fingerprint.update(filename.read_bytes())
+            except OSError:
+                continue
+        return fingerprint.hexdigest()
+
+    def get_signature(self):
+        # Modification time of each directory containing distributions. The
+        # signature changes if distributions are installed or removed
+        locations = {
+            m["Location"] for m in self.distributions.values() if "Location" in m
+        }
+        signature = []
+        for location in sorted(locations):
+            try:
+                signature.append((location, pathlib.Path(location).stat().st_mtime_ns))
+            except OSError:
+                signature.append((location, None))
+        return tuple(signature)
+
+    def get_names(self):
+        return sorted(m["Name"] for m in self.distributions.values())
+
+    def __len__(self):
+        return len(self.distributions)
@@ -0,0 +1,173 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import pathlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from lib4sbom.data.package import SBOMPackage
+from lib4sbom.data.relationship import SBOMRelationship
+
+from sbom4python.metrics import Metrics
+from sbom4python.normalise import MetadataNormaliser
+from sbom4python.scanner import SBOMScanner
+from sbom4python.store import FileStore, RelationshipStore
+
+
+def environment_filename(filename, environment):
+    # Filename for environment includes the location of the environment
+    if len(filename) == 0:
+        return filename
+    label = re.sub(r"[^\w.-]+", "_", str(environment)).strip("_")
+    path = pathlib.Path(filename)
+    return str(path.with_name(f"{path.stem}-{label}{path.suffix}"))
+
+
+class EnvironmentScanner:
+    """
+    Scans multiple Python environments concurrently. Each environment is
+    identified by a Python interpreter or a directory containing installed
+    distributions (e.g. site-packages). Remote metadata is only retrieved
+    once for packages which are found in more than one environment.
+
+    The results are available for each environment or merged with each
+    environment reported as a separate component.
+    """
+
+    def __init__(self, environments, debug=False, jobs=1, metrics=None, **options):
+        self.environments = list(environments)
+        self.debug = debug
+        self.jobs = max(1, jobs)
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Normalisation is shared as the same values occur in each environment
+        self.normaliser = MetadataNormaliser()
+        self.scanners = []
+        for environment in self.environments:
+            if pathlib.Path(environment).expanduser().is_dir():
+                location = {"site_packages": environment}
+            else:
+                location = {"python_path": environment}
+            self.scanners.append(
+                SBOMScanner(
+                    debug,
+                    jobs=self.jobs,
+                    metrics=self.metrics,
+                    normaliser=self.normaliser,
+                    **location,
+                    **options,
+                )
+            )
+        self.parent = "Python-system"
+
+    def _process(self, function):
+        # Environments are processed concurrently
+        with ThreadPoolExecutor(
+            max_workers=min(self.jobs, len(self.scanners))
+        ) as executor:
+            list(executor.map(function, self.environments, self.scanners))
+
+    def process_environments(self):
+        if len(self.scanners) == 0:
+            return
+        with self.metrics.phase("identification"):
+            self._process(lambda e, scanner: scanner.identify_system(e))
+        # Remote metadata is retrieved once for all environments
+        packages = dict.fromkeys(
+            p for scanner in self.scanners for p in scanner.get_pending_packages()
+        )
+        if self.debug:
+            print(
+                f"{len(packages)} unique packages in "
+                f"{len(self.scanners)} environments"
+            )
+        self.metrics.increment("environments", len(self.scanners))
+        self.scanners[0].enrich(packages)
+        for scanner in self.scanners[1:]:
+            scanner.set_remote_metadata(self.scanners[0].get_remote_metadata())
+        self._process(lambda e, scanner: scanner.complete_scan())
+
+    def close(self):
+        for scanner in self.scanners:
+            scanner.close()
+
+    def get_scanners(self):
+        # Returns (environment, scanner) for each environment
+        return list(zip(self.environments, self.scanners))
+
+    def get_unenriched(self):
+        return sum(scanner.get_unenriched() for scanner in self.scanners)
+
+    def network_disabled(self):
+        return any(scanner.network_disabled() for scanner in self.scanners)
+
+    def get_cache_info(self):
+        return self.normaliser.get_cache_info()
+
+    def get_metrics(self):
+        return self.scanners[0].get_metrics() if len(self.scanners) > 0 else None
+
+    def get_document(self):
+        return self.scanners[0].get_document()
+
+    def get_parent(self):
+        return self.parent
+
+    # Merged results. Each environment is reported as a package on which the
+    # packages within the environment depend
+
+    def _get_file_ids(self):
+        # File identifiers are reassigned so that they are unique. Files found
+        # in more than one environment are only reported once
+        file_ids = {}
+        for scanner in self.scanners:
+            scanner_files = scanner.get_files()
+            for name in scanner_files:
+                if name not in file_ids:
+                    stem = scanner_files[name]["id"].split("-", 1)[1]
+                    file_ids[name] = f"{len(file_ids) + 1}-{stem}"
+        return file_ids
+
+    def get_files(self):
+        files = FileStore()
+        file_ids = self._get_file_ids()
+        for scanner in self.scanners:
+            scanner_files = scanner.get_files()
+            for name in scanner_files:
+                if name not in files:
+                    files[name] = dict(scanner_files[name], id=file_ids[name])
+        return files
+
+    def get_packages(self):
+        # Packages found in more than one environment are only reported once
+        packages = {}
+        sbom_package = SBOMPackage()
+        for scanner in self.scanners:
+            sbom_package.initialise()
+            sbom_package.set_name(scanner.get_parent())
+            sbom_package.set_type("platform")
+            sbom_package.set_property("language", "Python")
+            sbom_package.set_property("python_version", scanner.python_version)
+            packages[(scanner.get_parent(), None)] = sbom_package.get_package()
+            for package, package_info in scanner.get_packages().items():
+                packages.setdefault(package, package_info)
+        return packages
+
+    def get_relationships(self):
+        relationships = RelationshipStore()
+        sbom_relationship = SBOMRelationship()
+        file_ids = self._get_file_ids()
+        for scanner in self.scanners:
+            sbom_relationship.initialise()
+            sbom_relationship.set_relationship(
+                self.parent, "DESCRIBES", scanner.get_parent()
+            )
+            relationships.append(sbom_relationship.get_relationship())
+            for relationship in scanner.get_relationships():
+                if relationship["source"] == scanner.get_parent():
+                    # Environment depends on the top level packages
+                    relationship["type"] = "DEPENDS_ON"
+                elif relationship.get("target_type") == "file":
+                    # Use reassigned file identifier
+                    relationship["target_id"] = file_ids[relationship["target"]]
+                relationships.append(relationship)
+        return relationships
@@ -0,0 +1,198 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import pathlib
+
+from lib4sbom.data.file import SBOMFile
+
+# File scanner used within each worker process
+_file_scanner = None
+
+
+def _initialise_worker(debug):
+    global _file_scanner
+    from sbom4files.filescanner import FileScanner
+
+    _file_scanner = FileScanner(debug=debug)
+
+
+def _scan_files(filenames):
+    results = []
+    for filename in filenames:
+        if _file_scanner.scan_file(filename):
+            results.append(_file_scanner.get_file())
+        else:
+            results.append(None)
+    return results
+
+
+def relative_name(filename):
+    # Name is relative to the current directory (as FileScanner)
+    return str(filename).replace(str(pathlib.Path.cwd()), ".")
+
+
+class FileAnalyser:
+    """
+    Analyses files using a pool of worker processes. The pool is started when
+    first required and is used until the analyser is closed.
+    """
+
+    def __init__(self, jobs=1, debug=False, chunk_size=64, cache=None, metrics=None):
+        self.jobs = max(1, jobs)
+        self.debug = debug
+        self.chunk_size = chunk_size
+        self.file_scanner = None
+        self.sbom_file = None
+        # Optional persistent cache of file analysis
+        self.cache = cache
+        # Optional instrumentation
+        self.metrics = metrics
+        self.executor = None
+
+    def _get_file_scanner(self):
+        if self.file_scanner is None:
+            # Only imported when files are analysed
+            from sbom4files.filescanner import FileScanner
+
+            self.file_scanner = FileScanner(debug=self.debug)
+        return self.file_scanner
+
+    def _recorded_file(self, filename, sha256):
+        # Analysis of file using the digest recorded when the file was
+        # installed. The contents of the file are not read.
+        if self.sbom_file is None:
+            self.sbom_file = SBOMFile()
+        self.sbom_file.initialise()
+        self.sbom_file.set_name(relative_name(filename))
+        file_type = "other"
+        for type, extensions in self._get_file_scanner().file_types.items():
+            if any(str(filename).endswith(ext) for ext in extensions):
+                file_type = type
+                break
+        self.sbom_file.set_filetype(file_type)
+        self.sbom_file.set_checksum("SHA256", sha256)
+        self.sbom_file.set_licenseinfoinfile("NOASSERTION")
+        self.sbom_file.set_licenseconcluded("NOASSERTION")
+        self.sbom_file.set_copyrighttext("NOASSERTION")
+        self.sbom_file.set_comment("Checksum obtained from installation record.")
+        return self.sbom_file.get_file()
+
+    def _recorded_size(self, filename, size):
+        # Check that installed file is the same size as the recorded file
+        try:
+            return size is not None and os.stat(filename).st_size == size
+        except OSError:
+            return False
+
+    def _analyse_serial(self, filenames):
+        self._get_file_scanner()
+        for filename in filenames:
+            if self.file_scanner.scan_file(filename):
+                yield self.file_scanner.get_file()
+            else:
+                yield None
+
+    def _analyse(self, filenames):
+        if self.jobs == 1 or len(filenames) <= self.chunk_size:
+            return list(self._analyse_serial(filenames))
+        chunks = [
+            filenames[i : i + self.chunk_size]
+            for i in range(0, len(filenames), self.chunk_size)
+        ]
+        if self.debug:
+            print(f"Analyse {len(filenames)} files using {self.jobs} processes")
+        results = []
+        for chunk_results in self._get_executor().map(_scan_files, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def _get_executor(self):
+        if self.executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Analysers may be used concurrently by several threads so worker
+            # processes are not forked from this process (if possible) as a
+            # forked process can inherit locks held by another thread
+            mp_context = None
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("forkserver")
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=mp_context,
+                initializer=_initialise_worker,
+                initargs=(self.debug,),
+            )
+        return self.executor
+
+    def close(self):
+        # Stop the worker processes (if started)
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _record_metrics(self, recorded, cached, filenames, analysed):
+        self.metrics.increment("files_recorded", recorded)
+        if self.cache is not None:
+            self.metrics.increment("file_cache_hits", cached)
+            self.metrics.increment("file_cache_misses", len(filenames))
+        scanned = [f for f, file_info in zip(filenames, analysed) if file_info]
+        self.metrics.increment("files_hashed", len(scanned))
+        bytes_read = 0
+        for filename in scanned:
+            try:
+                bytes_read += os.stat(filename).st_size
+            except OSError:
+                pass
+        self.metrics.increment("bytes_read", bytes_read)
+
+    def analyse(self, filenames, digests=None):
+        # Returns the analysis of each file (None if not analysed) in the same
+        # order as the filenames. File identifiers are not assigned.
+        # Digests are optional (SHA256 digest, size) of each file as recorded
+        # when the file was installed.
+        filenames = list(filenames)
+        if digests is None:
+            digests = [None] * len(filenames)
+        results = [None] * len(filenames)
+        required = []
+        recorded = 0
+        for position, (filename, digest) in enumerate(zip(filenames, digests)):
+            if digest is not None and self._recorded_size(filename, digest[1]):
+                results[position] = self._recorded_file(filename, digest[0])
+                recorded += 1
+                continue
+            file_info = None
+            if self.cache is not None:
+                file_info = self.cache.get(filename)
+            if file_info is not None:
+                file_info["name"] = relative_name(filename)
+                results[position] = file_info
+            else:
+                required.append(position)
+        cached = len(filenames) - len(required) - recorded
+        if self.debug and self.cache is not None:
+            print(f"Analysis of {cached} files cached")
+        analysed = self._analyse([filenames[position] for position in required])
+        if self.metrics is not None:
+            self._record_metrics(
+                recorded,
+                cached,
+                [filenames[position] for position in required],
+                analysed,
+            )
+        for position, file_info in zip(required, analysed):
+            results[position] = file_info
+        if self.cache is not None:
+            self.cache.store(
+                [
+                    (
+                        filenames[position],
+                        {k: v for k, v in file_info.items() if k not in ["name", "id"]},
+                    )
+                    for position, file_info in zip(required, analysed)
+                    if file_info is not None
+                ]
+            )
+        return results
@@ -0,0 +1,118 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import json
+import sys
+import threading
+import time
+
+
+class Metrics:
+    """
+    Records the time spent in each phase of processing together with counters
+    of significant events (e.g. network calls and files analysed).
+
+    Hooks are called with (event, name, value) as each measurement is made
+    where event is one of 'phase', 'counter' or 'latency'.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Phase name to accumulated wall time, CPU time and number of calls
+        self.phases = {}
+        self.counters = {}
+        # Enrichment latency (in seconds) keyed by package
+        self.latencies = {}
+        self.hooks = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def _notify(self, event, name, value):
+        for hook in self.hooks:
+            hook(event, name, value)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        # CPU time is for the whole process so includes any concurrent work
+        start_time = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            timing = {
+                "wall_time": time.perf_counter() - start_time,
+                "cpu_time": time.process_time() - start_cpu,
+            }
+            with self.lock:
+                phase = self.phases.setdefault(
+                    name, {"wall_time": 0.0, "cpu_time": 0.0, "calls": 0}
+                )
+                phase["wall_time"] += timing["wall_time"]
+                phase["cpu_time"] += timing["cpu_time"]
+                phase["calls"] += 1
+            self._notify("phase", name, timing)
+
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        self._notify("counter", name, value)
+
+    def set_counter(self, name, value):
+        with self.lock:
+            self.counters[name] = value
+
+    def record_latency(self, package, latency):
+        with self.lock:
+            self.latencies[package] = latency
+        self._notify("latency", package, latency)
+
+    def get_counter(self, name):
+        return self.counters.get(name, 0)
+
+    def get_metrics(self):
+        with self.lock:
+            latencies = sorted(self.latencies.values())
+            summary = {}
+            if len(latencies) > 0:
+                summary = {
+                    "count": len(latencies),
+                    "total": sum(latencies),
+                    "mean": sum(latencies) / len(latencies),
+                    "median": latencies[len(latencies) // 2],
+                    "max": latencies[-1],
+                }
+            return {
+                "phases": {name: dict(phase) for name, phase in self.phases.items()},
+                "counters": dict(self.counters),
+                "enrichment_latency": summary,
+                "package_latency": {
+                    f"{package}@{version}" if version is not None else package: latency
+                    for (package, version), latency in self.latencies.items()
+                },
+            }
+
+    def report(self, file=sys.stderr):
+        metrics = self.get_metrics()
+        print("Phase                  Wall (s)   CPU (s)   Calls", file=file)
+        for name, phase in metrics["phases"].items():
+            print(
+                f"{name:<20}{phase['wall_time']:>11.3f}{phase['cpu_time']:>10.3f}"
+                f"{phase['calls']:>8}",
+                file=file,
+            )
+        for name, value in sorted(metrics["counters"].items()):
+            print(f"{name:<32}{value:>12}", file=file)
+        summary = metrics["enrichment_latency"]
+        if len(summary) > 0:
+            print(
+                f"Enrichment latency (s) mean {summary['mean']:.3f}, "
+                f"median {summary['median']:.3f}, max {summary['max']:.3f} "
+                f"({summary['count']} packages)",
+                file=file,
+            )
+
+    def write(self, filename):
+        with open(filename, "w") as metrics_file:
+            json.dump(self.get_metrics(), metrics_file, indent=2)
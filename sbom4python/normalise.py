@@ -0,0 +1,148 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import re
+import string
+import unicodedata
+
+# Maximum number of entries retained in each cache
+DEFAULT_CACHE_SIZE = 4096
+
+# Names assumed to be at least two names <first> <surname>
+NAME_PATTERN = re.compile(r"[a-zA-Z\.\]+ [A-Za-z]+ ")
+# Use RFC-5322 compliant regex (https://regex101.com/library/6EL6YF)
+EMAIL_PATTERN = re.compile(
+    r"((?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\]))",
+    re.IGNORECASE,
+)
+SPACES_PATTERN = re.compile(" +")
+
+# Normalisation of Project-URL labels
+CATEGORY_REMOVAL_MAP = str.maketrans("", "", string.punctuation + string.whitespace)
+# Various synonyms of project URLs
+CATEGORIES = {
+    "docs": "documentation",
+    "source": "vcs",
+    "repository": "vcs",
+    "sourcecode": "vcs",
+    "github": "vcs",
+    "githubrepo": "vcs",
+    "gitlab": "vcs",
+    "bitbucket": "vcs",
+    "git": "vcs",
+    "sourceforge": "vcs",
+    "svn": "vcs",
+    "code": "vcs",
+    "changelog": "log",
+    "changes": "log",
+    "docschangelog": "log",
+    "whatsnew": "log",
+    "issues": "issue-tracker",
+    "bug": "issue-tracker",
+    "bugs": "issue-tracker",
+    "bugreports": "issue-tracker",
+    "bugtracker": "issue-tracker",
+    "issuetracker": "issue-tracker",
+    "tracker": "issue-tracker",
+    "githubissues": "issue-tracker",
+    "mailinglist": "mailing-list",
+    "mailinglists": "mailing-list",
+    "sourcedistribution": "source-distribution",
+    "ci": "build-system",
+    "cigithub": "build-system",
+    "cigithubactions": "build-system",
+    "buildsystem": "build-systen",
+    "releasenotes": "release-notes",
+    "release": "release-notes",
+    "releases": "release-notes",
+    "twitter": "social",
+    "discord": "social",
+    "home": "home-page",
+    "homepage": "home-page",
+    "githubhomepage": "home-page",
+}
+
+
+def format_supplier(supplier_info, include_email=True):
+    # See https://stackoverflow.com/questions/1207457/convert-a-unicode-string-to-a-string-in-python-containing-extra-symbols
+    # And convert byte object to a string
+    name_str = (
+        unicodedata.normalize("NFKD", supplier_info)
+        .encode("ascii", "ignore")
+        .decode("utf-8")
+    )
+    if " " in name_str:
+        # Get names assumed to be at least two names <first> <surname>
+        names = NAME_PATTERN.findall(name_str)
+    else:
+        # Handle case where only single name provided
+        names = [name_str]
+    supplier = " ".join(n for n in names)
+    if include_email:
+        # Get email addresses
+        emails = EMAIL_PATTERN.findall(supplier_info)
+        if len(emails) > 0:
+            # Only one email can be specified, so choose last one
+            supplier = supplier + "(" + emails[-1] + ")"
+    return SPACES_PATTERN.sub(" ", supplier.strip())
+
+
+def normalise_name(name):
+    # Normalise name as per PEP 503
+    return re.sub(r"[-_.]+", "-", name).lower().strip()
+
+
+def normalise_category(label):
+    return label.translate(CATEGORY_REMOVAL_MAP).lower()
+
+
+class MetadataNormaliser:
+    """
+    Normalisation of license and supplier information. As the same values
+    are repeated across many packages, results are cached.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        # License scanner (which loads the SPDX license list) is only created
+        # when a license is first normalised
+        self.license_scanner = None
+        self.find_license = functools.lru_cache(maxsize=cache_size)(self._find_license)
+        self.deprecated = functools.lru_cache(maxsize=cache_size)(self._deprecated)
+        self.format_supplier = functools.lru_cache(maxsize=cache_size)(format_supplier)
+
+    def _get_license_scanner(self):
+        if self.license_scanner is None:
+            from lib4sbom.license import LicenseScanner
+
+            self.license_scanner = LicenseScanner()
+        return self.license_scanner
+
+    def _find_license(self, license):
+        return self._get_license_scanner().find_license(license)
+
+    def _deprecated(self, license):
+        return self._get_license_scanner().deprecated(license)
+
+    def get_cache_info(self, previous=None):
+        # Returns hits, misses and hit rate of each cache. If previous cache
+        # information is specified, only the subsequent usage is reported
+        cache_info = {}
+        for name, function in [
+            ("license", self.find_license),
+            ("deprecated", self.deprecated),
+            ("supplier", self.format_supplier),
+        ]:
+            info = function.cache_info()
+            hits = info.hits
+            misses = info.misses
+            if previous is not None:
+                hits -= previous[name]["hits"]
+                misses -= previous[name]["misses"]
+            lookups = hits + misses
+            cache_info[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / lookups if lookups > 0 else 0.0,
+            }
+        return cache_info
@@ -0,0 +1,97 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+
+from packaging.markers import (
+    UndefinedComparison,
+    UndefinedEnvironmentName,
+    default_environment,
+)
+from packaging.requirements import InvalidRequirement, Requirement
+
+from sbom4python.normalise import normalise_name
+
+
+@functools.lru_cache(maxsize=None)
+def parse_requirement(requirement):
+    # Requirement as defined by PEP 508. None if the requirement is not valid.
+    # The same requirements are specified by many distributions so each
+    # requirement is only parsed once
+    try:
+        return Requirement(requirement.strip())
+    except InvalidRequirement:
+        return None
+
+
+def pinned_version(requirement):
+    # Version of a requirement which is pinned to a single version (e.g. ==1.0)
+    specifiers = list(requirement.specifier)
+    if len(specifiers) == 1 and specifiers[0].operator in ["==", "==="]:
+        if not specifiers[0].version.endswith(".*"):
+            return specifiers[0].version
+    return None
+
+
+class RequirementParser:
+    """
+    Parses requirements and evaluates environment markers for the environment
+    being scanned so that requirements which would not be installed (e.g.
+    platform specific dependencies) are ignored. The results are cached as
+    the same requirements are specified by many distributions.
+    """
+
+    def __init__(self, environment=None, extras=None, debug=False):
+        self.debug = debug
+        # Marker values (PEP 508) of the environment. Defaults to the values
+        # of the current interpreter
+        self.environment = default_environment()
+        if environment is not None:
+            self.environment.update(environment)
+        # Extras selected for the packages being scanned
+        self.extras = [normalise_name(extra) for extra in (extras or [])]
+        self.results = {}
+
+    def parse(self, requirement):
+        return parse_requirement(requirement)
+
+    def is_active(self, requirement, extra=""):
+        # Requirements which are not valid are assumed to be active
+        key = (requirement, extra)
+        active = self.results.get(key)
+        if active is None:
+            active = self._evaluate(parse_requirement(requirement), extra)
+            self.results[key] = active
+            if self.debug and not active:
+                print(f"Requirement {requirement} ignored for extra '{extra}'")
+        return active
+
+    def _evaluate(self, requirement, extra):
+        if requirement is None or requirement.marker is None:
+            return True
+        environment = dict(self.environment)
+        environment["extra"] = extra
+        try:
+            return requirement.marker.evaluate(environment)
+        except (UndefinedComparison, UndefinedEnvironmentName):
+            # Unable to evaluate marker so requirement is assumed to be active
+            return True
+
+    def get_dependencies(self, requirements, extras, previous_extras=()):
+        # Name and extras of each requirement which is active for any of the
+        # extras but not for any of the previous extras. The empty extra
+        # selects the requirements which are not optional
+        dependencies = []
+        for requirement in requirements:
+            if any(self.is_active(requirement, e) for e in previous_extras):
+                continue
+            if not any(self.is_active(requirement, e) for e in extras):
+                continue
+            parsed = parse_requirement(requirement)
+            if parsed is None:
+                if self.debug:
+                    print(f"[WARNING] Invalid requirement {requirement}")
+                continue
+            extras_requested = sorted(normalise_name(e) for e in parsed.extras)
+            dependencies.append((parsed.name, tuple(extras_requested)))
+        return dependencies
@@ -2,14 +2,24 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import ast
+import base64
 import configparser
+import copy
+import datetime
+import fnmatch
+import glob
+import hashlib
+import json
+import os
 import pathlib
 import platform
 import re
-import string
 import subprocess
 import sys
-import unicodedata
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable
 
 if sys.version_info >= (3, 11):
@@ -17,17 +27,120 @@ if sys.version_info >= (3, 11):
 else:
     import toml
 
-if sys.version_info >= (3, 10):
-    from importlib import metadata as importlib_metadata
-else:
-    import importlib_metadata
-
-from lib4package.metadata import Metadata
 from lib4sbom.data.document import SBOMDocument
 from lib4sbom.data.package import SBOMPackage
 from lib4sbom.data.relationship import SBOMRelationship
-from lib4sbom.license import LicenseScanner
-from sbom4files.filescanner import FileScanner
+
+from sbom4python.distribution import DistributionIndex, normalise_name
+from sbom4python.fileanalysis import FileAnalyser, relative_name
+from sbom4python.metrics import Metrics
+from sbom4python.normalise import CATEGORIES, MetadataNormaliser, normalise_category
+from sbom4python.requirement import RequirementParser, parse_requirement, pinned_version
+from sbom4python.store import FileStore, RelationshipStore
+
+# Http libraries and methods used to interact with external services
+SERVICE_MODULES = ["requests", "urllib", "httplib2"]
+SERVICE_METHODS = ["get", "post", "put", "delete"]
+SERVICE_MODULE_NAMES = [m.encode() for m in SERVICE_MODULES]
+SERVICE_ENDPOINT = b"http"
+
+# Number of files analysed together to limit the files held in memory
+FILE_BATCH_SIZE = 1024
+
+# Checksum algorithms of lock files in order of preference
+LOCK_CHECKSUM_ALGORITHMS = {
+    "sha256": "SHA256",
+    "sha512": "SHA512",
+    "sha384": "SHA384",
+    "sha3_256": "SHA3-256",
+    "sha3_384": "SHA3-384",
+    "sha3_512": "SHA3-512",
+    "sha1": "SHA1",
+    "md5": "MD5",
+}
+PYPI_REGISTRY = "https://pypi.org/"
+# Comments and options of individual requirements in a requirements file
+REQUIREMENTS_COMMENT = re.compile(r"(^|\s+)#.*$")
+REQUIREMENT_OPTIONS = re.compile(
+    r"\s(--hash|--config-settings|-C|--global-option|--install-option)[=\s].*$"
+)
+# Remote metadata of a package for which all information is available locally
+LOCAL_METADATA = {
+    "release_date": None,
+    "license": None,
+    "originator": None,
+    "homepage": None,
+    "description": None,
+    "checksum": None,
+    "checksum_algorithm": None,
+}
+
+
+class ServiceVisitor(ast.NodeVisitor):
+    """
+    Identifies potential external service interactions in Python code.
+    """
+
+    def __init__(self, stop_early=False):
+        # Dictionary used to maintain order of services
+        self.potential_external_services = {}
+        self.potential_endpoint = []
+        self.stop_early = stop_early
+
+    def _check_complete(self):
+        if (
+            self.stop_early
+            and len(self.potential_external_services) > 0
+            and len(self.potential_endpoint) > 0
+        ):
+            raise StopIteration
+
+    def visit_Attribute(self, node):
+        # Check for function calls on http libraries like requests or urllib
+        if (
+            isinstance(node.value, ast.Name)
+            and node.value.id in SERVICE_MODULES
+            and node.attr in SERVICE_METHODS
+        ):
+            self.potential_external_services[(node.value.id, node.attr)] = True
+            self._check_complete()
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        if node.value is not None:
+            constant = str(node.value)
+            if constant.startswith("http") and "//" in constant and len(constant) > 8:
+                self.potential_endpoint.append(constant)
+                self._check_complete()
+
+
+class ScanResult:
+    """
+    Result of a scan: the SBOM document, files, packages and relationships
+    together with the metrics of the scan.
+    """
+
+    def __init__(self, scanner):
+        self.parent = scanner.get_parent()
+        self.document = scanner.get_document()
+        self.files = scanner.get_files()
+        self.packages = scanner.get_packages()
+        self.relationships = scanner.get_relationships()
+        self.metrics = scanner.get_metrics()
+        # Number of packages for which remote metadata was not retrieved
+        self.unenriched = scanner.get_unenriched()
+        self.network_disabled = scanner.network_disabled()
+
+    def get_sbom(self):
+        # SBOM suitable for lib4sbom generators
+        from lib4sbom.sbom import SBOM
+
+        sbom = SBOM()
+        sbom.add_document(self.document)
+        sbom.add_files(self.files)
+        sbom.add_packages(self.packages)
+        sbom.add_relationships(self.relationships)
+        return sbom
 
 
 class SBOMScanner:
@@ -44,113 +157,477 @@ class SBOMScanner:
         include_service=False,
         use_pip=False,
         python_path: str = None,
+        use_record=False,
+        jobs=1,
+        cache=None,
+        file_cache=None,
+        offline=False,
+        max_failures=10,
+        network_budget=None,
+        metrics=None,
+        site_packages=None,
+        normaliser=None,
+        extras=None,
     ):
         self.record = []
         self.debug = debug
         self.include_file = include_file
         self.include_license = exclude_license
         self.include_service = include_service
-        self.sbom_package = SBOMPackage()
-        self.sbom_relationship = SBOMRelationship()
+        self.lifecycle = lifecycle
+        # Instrumentation of the scan
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.normaliser = normaliser if normaliser is not None else MetadataNormaliser()
+        # Package builder for each thread as creating a builder is expensive
+        self.builders = threading.local()
+        self.python_version = platform.python_version()
+        self.distribution_index = None
+        self.index_lock = threading.Lock()
+        self.use_pip = use_pip
+        self.use_record = use_record
+        self.python_path = None
+        if python_path is not None and len(python_path) > 0:
+            self.python_path = pathlib.Path(python_path).expanduser()
+        # Directory containing distributions (e.g. site-packages)
+        self.site_packages = None
+        if site_packages is not None and len(site_packages) > 0:
+            self.site_packages = pathlib.Path(site_packages).expanduser()
+        self.jobs = max(1, jobs)
+        # Optional persistent cache of remote metadata
+        self.cache = cache
+        # Optional persistent cache of file analysis
+        self.file_cache = file_cache
+        # Network circuit breaker. Once open, no further remote lookups are made
+        self.offline = offline
+        self.max_failures = max_failures
+        self.network_budget = network_budget
+        # Results of service analysis keyed by digest of code
+        self.service_cache = {}
+        # Extras selected for the modules and requirements being scanned
+        self.extras = extras if extras is not None else []
+        self.requirement_parser = None
+        self._initialise_scan()
+
+    def _initialise_scan(self):
+        # State which is only used by a single scan
         self.sbom_document = SBOMDocument()
-        self.file_scanner = FileScanner()
-        self.license = LicenseScanner()
-        self.sbom_files = {}
+        self.set_lifecycle(self.lifecycle)
+        # Usage of the normalisation caches (which may be shared by scans)
+        # at the start of the scan
+        self.normalisation_start = self.normaliser.get_cache_info()
+        self.file_analyser = FileAnalyser(
+            jobs=self.jobs,
+            debug=self.debug,
+            cache=self.file_cache,
+            metrics=self.metrics,
+        )
+        self.sbom_files = FileStore()
         self.sbom_packages = {}
-        self.sbom_relationships = []
+        self.sbom_relationships = RelationshipStore()
+        self.deferred_relationships = RelationshipStore()
         self.parent = "NOT_DEFINED"
-        self.package_metadata = Metadata("python", debug=self.debug)
-        self.python_version = platform.python_version()
-        self.set_lifecycle(lifecycle)
-        self.metadata = {}
-        self.use_pip = use_pip
-        self.python_path = pathlib.Path(python_path).expanduser()
+        # Relationship between parent and top level packages
+        self.parent_relationship = "DESCRIBES"
+        # Normalised module name to package name (None if not found)
+        self.resolved_modules = {}
+        # Package name to requirements of the package
+        self.dependency_map = {}
+        # Package name to extras for which dependencies have been traversed
+        self.expanded_extras = {}
+        self.network_lock = threading.Lock()
+        self.network_failures = 0
+        self.network_time = 0.0
+        self.circuit_open = False
+        self.unenriched = 0
+        # Remote metadata keyed by (package, version). None if unavailable
+        self.remote_metadata = {}
+        # Packages awaiting creation, in the order in which they were found
+        self.pending_packages = {}
+        # Packages awaiting creation keyed by normalised name
+        self.pending_names = {}
+        # Distribution recorded by a lock file keyed by (package, version)
+        self.lock_sources = {}
+        # Files awaiting analysis, in the order in which they were found
+        self.pending_files = []
+        self.file_id = 1
+        # Optional writer to which elements are passed rather than retained
+        self.writer = None
+        # Optional state of previous scan for incremental scanning
+        self.state = None
+        # Analysis of unchanged distributions keyed by package identifier
+        self.previous_packages = {}
+
+    def _get_package_builder(self):
+        sbom_package = getattr(self.builders, "sbom_package", None)
+        if sbom_package is None:
+            sbom_package = SBOMPackage()
+            self.builders.sbom_package = sbom_package
+        return sbom_package
+
+    def set_writer(self, writer):
+        self.writer = writer
+
+    def set_state(self, state):
+        self.state = state
 
     def set_parent(self, module):
         self.parent = f"Python-{module}"
 
     def run_pip_cmd(self, params: Iterable[str]):
         cmd = ["pip"]
-        if self.python_path.exists():
+        if self.python_path is not None and self.python_path.exists():
             cmd.extend(("--python", str(self.python_path)))
 
         cmd.extend(params)
         return self.run_program(cmd)
 
     def run_program(self, params: Iterable[str]):
-        res = subprocess.run(list(params), capture_output=True, text=True)
+        params = list(params)
+        self.metrics.increment("subprocess_launches")
+        try:
+            res = subprocess.run(params, capture_output=True, text=True)
+        except OSError as ex:
+            print(f"[ERROR] Unable to run {params[0]} - {ex}", file=sys.stderr)
+            return []
         return res.stdout.splitlines()
 
     def set_lifecycle(self, lifecycle):
         self.sbom_document.set_value("lifecycle", lifecycle)
 
-    def _format_supplier(self, supplier_info, include_email=True):
-        # See https://stackoverflow.com/questions/1207457/convert-a-unicode-string-to-a-string-in-python-containing-extra-symbols
-        # And convert byte object to a string
-        name_str = (
-            unicodedata.normalize("NFKD", supplier_info)
-            .encode("ascii", "ignore")
-            .decode("utf-8")
-        )
-        if " " in name_str:
-            # Get names assumed to be at least two names <first> <surname>
-            names = re.findall(r"[a-zA-Z\.\]+ [A-Za-z]+ ", name_str)
-        else:
-            # Handle case where only single name provided
-            names = [name_str]
-        # Get email addresses
-        # Use RFC-5322 compliant regex (https://regex101.com/library/6EL6YF)
-        emails = re.findall(
-            r"((?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\]))",
-            supplier_info,
-            re.IGNORECASE,
-        )
-        supplier = " ".join(n for n in names)
-        if include_email and len(emails) > 0:
-            # Only one email can be specified, so choose last one
-            supplier = supplier + "(" + emails[-1] + ")"
-        return re.sub(" +", " ", supplier.strip())
-
-    def _create_package(self, package, version, parent="-", requirements=None):
-        self.sbom_package.initialise()
-        offline = False
+    def _fetch_metadata(self, package, version, checksum=True):
+        with self.network_lock:
+            # Limits of zero disable remote metadata before any lookup
+            self._check_circuit()
+        if self.offline:
+            return None
+        start_time = time.monotonic()
+        metadata = self._retrieve_metadata(package, version, checksum)
+        latency = time.monotonic() - start_time
+        self.metrics.record_latency((package, version), latency)
+        with self.network_lock:
+            self.network_time += latency
+            if metadata is None:
+                self.network_failures += 1
+            else:
+                self.network_failures = 0
+            self._check_circuit()
+        return metadata
+
+    def _check_circuit(self):
+        # Called with the network lock held
+        if self.offline:
+            return
+        if self.network_failures >= self.max_failures:
+            self._open_circuit(f"{self.network_failures} consecutive metadata failures")
+        elif (
+            self.network_budget is not None and self.network_time >= self.network_budget
+        ):
+            self._open_circuit(
+                f"network time budget of {self.network_budget}s exceeded"
+            )
+
+    def _open_circuit(self, reason):
+        # Switch to offline operation for the rest of the scan
+        if self.debug:
+            print(f"[ERROR] Remote metadata disabled - {reason}")
+        self.offline = True
+        self.circuit_open = True
+
+    def _retrieve_metadata(self, package, version, checksum=True):
+        # Only imported if remote metadata is required
+        from lib4package.metadata import Metadata
+
+        # A separate Metadata instance is used for each lookup so that
+        # lookups can be performed concurrently
+        package_metadata = Metadata("python", debug=self.debug)
+        self.metrics.increment("network_calls")
         try:
-            self.package_metadata.get_package(package, version)
+            package_metadata.get_package(package, version)
+            if len(package_metadata.get_data()) == 0:
+                # Package not found or registry not available
+                if self.debug:
+                    print(f"[ERROR] No metadata retrieved for {package}")
+                return None
+            checksum_algorithm = None
+            if checksum:
+                checksum, checksum_algorithm = package_metadata.get_checksum(
+                    version=version
+                )
+            else:
+                checksum = None
+            return {
+                "release_date": (
+                    package_metadata.get_latest_release_time()
+                    if version is not None
+                    else None
+                ),
+                "license": package_metadata.get_license(),
+                "originator": package_metadata.get_originator(),
+                "homepage": package_metadata.get_homepage(),
+                "description": package_metadata.get_description(),
+                "checksum": checksum,
+                "checksum_algorithm": checksum_algorithm,
+            }
         except Exception as ex:
-            offline = True
             if self.debug:
                 print(f"[ERROR] Unable to retrieve metadata for {package} - {ex}")
-        self.sbom_package.set_name(package)
-        self.sbom_package.set_property("language", "Python")
-        self.sbom_package.set_property("python_version", self.python_version)
+            return None
+
+    def _enrich_packages(self, packages):
+        with self.metrics.phase("enrichment"):
+            self._retrieve_packages(packages)
+
+    def _retrieve_packages(self, packages):
+        # Retrieve remote metadata for all packages not already retrieved
+        lookups = {}
+        for package in dict.fromkeys(packages):
+            if package in self.remote_metadata:
+                continue
+            if not self._from_pypi(package):
+                # Metadata is only available for packages from PyPI
+                self.remote_metadata[package] = None
+            elif not self._locked(package):
+                lookups[package] = package
+            elif len(self.pending_packages.get(package, ("", None, {}))[2]) > 0:
+                # Lock file and installed distribution provide all information
+                self.remote_metadata[package] = LOCAL_METADATA
+            else:
+                # Only the metadata of the project (license, supplier, etc.)
+                # is required which is not specific to the version
+                lookups[package] = (package[0], None)
+        # Checksums are not required if only required for locked packages
+        checksums = {k for p, k in lookups.items() if p == k}
+        required = [k for k in dict.fromkeys(lookups.values())]
+        self._retrieve_lookups(
+            [k for k in required if k not in self.remote_metadata], checksums
+        )
+        unenriched = 0
+        for package, key in lookups.items():
+            self.remote_metadata[package] = self.remote_metadata[key]
+            if self.remote_metadata[package] is None:
+                unenriched += 1
+        with self.network_lock:
+            self.unenriched += unenriched
+
+    def _retrieve_lookups(self, required, checksums):
+        if self.cache is not None:
+            not_cached = []
+            for package in required:
+                cached_metadata = self.cache.get(*package)
+                if cached_metadata is not None:
+                    self.remote_metadata[package] = cached_metadata
+                else:
+                    not_cached.append(package)
+            self.metrics.increment(
+                "metadata_cache_hits", len(required) - len(not_cached)
+            )
+            self.metrics.increment("metadata_cache_misses", len(not_cached))
+            if self.debug:
+                print(f"Metadata for {len(required) - len(not_cached)} packages cached")
+            required = not_cached
+        if len(required) == 0:
+            return
+        if self.offline:
+            # No remote metadata available
+            for package in required:
+                self.remote_metadata[package] = None
+            return
+        if self.debug:
+            print(f"Retrieve metadata for {len(required)} packages")
+        if self.jobs > 1 and len(required) > 1:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                results = executor.map(
+                    lambda p: self._fetch_metadata(*p, p in checksums), required
+                )
+                for package, result in zip(required, results):
+                    self.remote_metadata[package] = result
+        else:
+            for package in required:
+                self.remote_metadata[package] = self._fetch_metadata(
+                    *package, package in checksums
+                )
+        if self.cache is not None:
+            # Failed lookups are not cached so that they are retried
+            self.cache.store(
+                [
+                    (package, self.remote_metadata[package])
+                    for package in required
+                    if self.remote_metadata[package] is not None
+                ]
+            )
+
+    def _from_pypi(self, package):
+        # Package is (name, version). Packages are assumed to be from PyPI
+        # unless another registry is recorded by a lock file
+        registry = self.lock_sources.get(package, {}).get("registry")
+        return registry is None or registry.startswith(PYPI_REGISTRY)
+
+    def _locked(self, package):
+        # Lock file provides the checksum and release date of the package
+        source = self.lock_sources.get(package, {})
+        return (
+            source.get("checksum") is not None
+            and source.get("release_date") is not None
+        )
+
+    def _get_remote_metadata(self, package, version):
+        if (package, version) not in self.remote_metadata:
+            self._enrich_packages([(package, version)])
+        return self.remote_metadata[(package, version)]
+
+    def _queue_package(
+        self, package, version, parent="-", requirements=None, metadata=None
+    ):
+        # Package creation is deferred so that remote metadata for all packages
+        # can be retrieved together
+        # Package found in more than one requirements file is reported once
+        name = normalise_name(package)
+        if version is None and name in self.pending_names:
+            return
+        self.pending_packages.setdefault(
+            (package, version),
+            (parent, requirements, metadata if metadata is not None else {}),
+        )
+        self.pending_names.setdefault(name, (package, version))
+
+    def get_pending_packages(self):
+        # Packages awaiting creation which require remote metadata. Packages
+        # of unchanged distributions are not enriched again
+        return [
+            p
+            for p in self.pending_packages.keys()
+            if f"{p[0]}_{p[1]}" not in self.previous_packages
+        ]
+
+    def enrich(self, packages):
+        # Retrieve remote metadata for (package, version) pairs in advance of
+        # packages being created
+        self._enrich_packages(packages)
+
+    def get_remote_metadata(self):
+        return self.remote_metadata
+
+    def set_remote_metadata(self, remote_metadata):
+        # Remote metadata may be shared between scanners
+        self.remote_metadata = remote_metadata
+
+    def _flush_packages(self):
+        if len(self.pending_packages) > 0:
+            self._enrich_packages(self.get_pending_packages())
+            # Create packages in the order in which they were found
+            with self.metrics.phase("package_creation"):
+                for (package, version), (
+                    parent,
+                    requirements,
+                    metadata,
+                ) in self.pending_packages.items():
+                    package_id = f"{package}_{version}"
+                    previous = self.previous_packages.pop(package_id, None)
+                    if previous is not None:
+                        package_info = previous["package"]
+                        enriched = previous["enriched"]
+                        self._add_package((package, version), package_info)
+                        self.metrics.increment("packages_reused")
+                    else:
+                        package_info = self._create_package(
+                            package, version, parent, requirements, metadata
+                        )
+                        enriched = self.remote_metadata[(package, version)] is not None
+                    if self.state is not None:
+                        self.state.add_package(
+                            package_id, package_info, parent == "-", enriched
+                        )
+            self.pending_packages = {}
+            self.pending_names = {}
+        self._analyse_files()
+        if self.writer is not None:
+            self.writer.commit()
+        else:
+            self.sbom_relationships.extend(self.deferred_relationships)
+            self.deferred_relationships = RelationshipStore()
+
+    def _analyse_files(self):
+        if len(self.pending_files) == 0:
+            return
+        # Files of unchanged distributions are not analysed again
+        required = [f for f in self.pending_files if f[4] is None]
+        with self.metrics.phase("file_analysis"):
+            results = iter(
+                self.file_analyser.analyse(
+                    [entry for _, _, entry, _, _ in required],
+                    [digest for _, _, _, digest, _ in required],
+                )
+            )
+        # Files are identified in the order in which they were found
+        for package, package_id, entry, _, previous in self.pending_files:
+            if previous is not None:
+                file_info = dict(previous)
+                entry = pathlib.Path(file_info["name"])
+                file_info["name"] = relative_name(entry)
+                self.metrics.increment("files_reused")
+            else:
+                file_info = next(results)
+            if file_info is None:
+                continue
+            file_info["id"] = f"{self.file_id}-{entry.stem}"
+            self.file_id += 1
+            self._add_file(file_info)
+            if self.state is not None:
+                self.state.add_file(package_id, entry, file_info)
+            # Add relationship
+            sbom_relationship = SBOMRelationship()
+            sbom_relationship.set_relationship(package, "CONTAINS", file_info["name"])
+            sbom_relationship.set_relationship_id(package_id, file_info["id"])
+            sbom_relationship.set_target_type("file")
+            self._add_relationship(sbom_relationship.get_relationship(), deferred=True)
+        self.pending_files = []
+
+    def _create_package(
+        self, package, version, parent="-", requirements=None, metadata=None
+    ):
+        # Returns the package. All information about the package is local so
+        # that packages can be created concurrently
+        if metadata is None:
+            metadata = {}
+        sbom_package = self._get_package_builder()
+        sbom_package.initialise()
+        remote_metadata = self._get_remote_metadata(package, version)
+        offline = remote_metadata is None
+        # Information in a lock file takes precedence over remote metadata
+        source = self.lock_sources.get((package, version), {})
+        sbom_package.set_name(package)
+        sbom_package.set_property("language", "Python")
+        sbom_package.set_property("python_version", self.python_version)
         if version is not None:
-            self.sbom_package.set_version(version)
-            if not offline:
+            sbom_package.set_version(version)
+            if source.get("release_date") is not None:
+                sbom_package.set_value("release_date", source["release_date"])
+            elif not offline:
                 # External metadata may lag releases
-                self.sbom_package.set_value(
-                    "release_date", self.package_metadata.get_latest_release_time()
-                )
+                sbom_package.set_value("release_date", remote_metadata["release_date"])
         if requirements is not None:
-            self.sbom_package.set_evidence(requirements)
+            sbom_package.set_evidence(requirements)
         if parent == "-":
-            self.sbom_package.set_type("application")
-        self.sbom_package.set_filesanalysis(self.include_file)
+            sbom_package.set_type("application")
+        sbom_package.set_filesanalysis(self.include_file)
         # Get package metadata
-        if len(self.metadata) > 0:
-            license_information = self.get("License")
-            supplier = self.get("Author") + " " + self.get("Author-email")
-            home_page = self.get("Home-page")
-            summary = self.get("Summary")
+        if len(metadata) > 0:
+            license_information = self.get("License", metadata)
+            supplier = (
+                self.get("Author", metadata) + " " + self.get("Author-email", metadata)
+            )
+            home_page = self.get("Home-page", metadata)
+            summary = self.get("Summary", metadata)
         elif not offline:
-            license_information = self.package_metadata.get_license()
+            license_information = remote_metadata["license"]
             # Supplier info
-            supplier = self.package_metadata.get_originator()
+            supplier = remote_metadata["originator"]
             if supplier is None:
                 supplier = ""
-            home_page = self.package_metadata.get_homepage()
+            home_page = remote_metadata["homepage"]
             if home_page is None:
                 home_page = ""
-            summary = self.package_metadata.get_description()
+            summary = remote_metadata["description"]
             if summary is None:
                 summary = ""
         else:
@@ -158,149 +635,148 @@ class SBOMScanner:
             supplier = ""
             home_page = ""
             summary = ""
-        license = self.license.find_license(license_information)
+        license = self.normaliser.find_license(license_information)
         # Report license as reported by metadata. If not valid SPDX, report NOASSERTION
         if license != license_information:
-            self.sbom_package.set_licensedeclared("NOASSERTION")
+            sbom_package.set_licensedeclared("NOASSERTION")
         else:
-            self.sbom_package.set_licensedeclared(license)
+            sbom_package.set_licensedeclared(license)
         # Report license if valid SPDX identifier
-        self.sbom_package.set_licenseconcluded(license)
+        sbom_package.set_licenseconcluded(license)
         # Add comment if metadata license was modified
         license_comment = ""
         if len(license_information) > 0 and license != license_information:
             license_comment = f"{package} declares {license_information} which is not currently a valid SPDX License identifier or expression."
         # Report if license is deprecated
-        if self.license.deprecated(license):
+        if self.normaliser.deprecated(license):
             deprecated_comment = f"{license} is now deprecated."
             if len(license_comment) > 0:
                 license_comment = f"{license_comment} {deprecated_comment}"
             else:
                 license_comment = deprecated_comment
         if len(license_comment) > 0:
-            self.sbom_package.set_licensecomments(license_comment)
+            sbom_package.set_licensecomments(license_comment)
         if len(supplier.split()) > 3:
-            self.sbom_package.set_supplier(
-                "Organization", self._format_supplier(supplier)
+            sbom_package.set_supplier(
+                "Organization", self.normaliser.format_supplier(supplier)
             )
         elif len(supplier) > 1:
-            self.sbom_package.set_supplier("Person", self._format_supplier(supplier))
+            sbom_package.set_supplier(
+                "Person", self.normaliser.format_supplier(supplier)
+            )
         else:
-            self.sbom_package.set_supplier("UNKNOWN", "NOASSERTION")
+            sbom_package.set_supplier("UNKNOWN", "NOASSERTION")
         if home_page != "":
-            self.sbom_package.set_homepage(home_page)
+            sbom_package.set_homepage(home_page)
         if summary != "":
-            self.sbom_package.set_summary(summary)
-        if self.metadata.get("Project-URL") is not None:
+            sbom_package.set_summary(summary)
+        if metadata.get("Project-URL") is not None:
             # Extra references
-            # Normalisation of labels
-            chars_to_remove = string.punctuation + string.whitespace
-            removal_map = str.maketrans("", "", chars_to_remove)
-            # Various synonyms of project URLs
-            categories = {
-                "docs": "documentation",
-                "source": "vcs",
-                "repository": "vcs",
-                "sourcecode": "vcs",
-                "github": "vcs",
-                "githubrepo": "vcs",
-                "gitlab": "vcs",
-                "bitbucket": "vcs",
-                "git": "vcs",
-                "sourceforge": "vcs",
-                "svn": "vcs",
-                "code": "vcs",
-                "changelog": "log",
-                "changes": "log",
-                "docschangelog": "log",
-                "whatsnew": "log",
-                "issues": "issue-tracker",
-                "bug": "issue-tracker",
-                "bugs": "issue-tracker",
-                "bugreports": "issue-tracker",
-                "bugtracker": "issue-tracker",
-                "issuetracker": "issue-tracker",
-                "tracker": "issue-tracker",
-                "githubissues": "issue-tracker",
-                "mailinglist": "mailing-list",
-                "mailinglists": "mailing-list",
-                "sourcedistribution": "source-distribution",
-                "ci": "build-system",
-                "cigithub": "build-system",
-                "cigithubactions": "build-system",
-                "buildsystem": "build-systen",
-                "releasenotes": "release-notes",
-                "release": "release-notes",
-                "releases": "release-notes",
-                "twitter": "social",
-                "discord": "social",
-                "home": "home-page",
-                "homepage": "home-page",
-                "githubhomepage": "home-page",
-            }
-            for ref in self.metadata.get("Project-URL"):
-                category = ref.split(", ")[0].translate(removal_map).lower()
+            for ref in metadata.get("Project-URL"):
+                category = normalise_category(ref.split(", ")[0])
                 locator = ref.split(", ")[1]
                 # See if synonymn
-                if categories.get(category) is not None:
+                if CATEGORIES.get(category) is not None:
                     if self.debug:
                         print(
-                            f"Updating category from {category} to {categories[category]}"
+                            f"Updating category from {category} to {CATEGORIES[category]}"
                         )
-                    category = categories[category]
+                    category = CATEGORIES[category]
                 if category == "home-page":
-                    self.sbom_package.set_homepage(locator)
+                    sbom_package.set_homepage(locator)
                 else:
-                    self.sbom_package.set_externalreference("OTHER", category, locator)
-        if self.metadata.get("Download-URL") is None:
-            if version is None:
-                self.sbom_package.set_downloadlocation(
+                    sbom_package.set_externalreference("OTHER", category, locator)
+        if metadata.get("Download-URL") is None:
+            if source.get("download_location") is not None:
+                sbom_package.set_downloadlocation(source["download_location"])
+            elif version is None:
+                sbom_package.set_downloadlocation(
                     f"https://pypi.org/project/{package}/#files"
                 )
             else:
-                self.sbom_package.set_downloadlocation(
+                sbom_package.set_downloadlocation(
                     f"https://pypi.org/project/{package}/{version}/#files"
                 )
         else:
-            self.sbom_package.set_downloadlocation(self.metadata.get("Download-URL"))
+            sbom_package.set_downloadlocation(metadata.get("Download-URL"))
         # External references
+        purl_qualifier = ""
+        if not self._from_pypi((package, version)):
+            registry = urllib.parse.quote(source["registry"], safe=":/")
+            purl_qualifier = f"?repository_url={registry}"
         if version is not None:
-            self.sbom_package.set_purl(f"pkg:pypi/{package}@{version}")
+            sbom_package.set_purl(f"pkg:pypi/{package}@{version}{purl_qualifier}")
         else:
-            self.sbom_package.set_purl(f"pkg:pypi/{package}")
+            sbom_package.set_purl(f"pkg:pypi/{package}{purl_qualifier}")
         if len(supplier) > 1:
-            component_supplier = self._format_supplier(supplier, include_email=False)
+            component_supplier = self.normaliser.format_supplier(
+                supplier, include_email=False
+            )
             if version is not None:
                 cpe_version = version.replace(":", "\\:")
             else:
                 cpe_version = ""
-            self.sbom_package.set_cpe(
+            sbom_package.set_cpe(
                 f"cpe:2.3:a:{component_supplier.replace(' ', '_').lower()}:{package}:{cpe_version}:*:*:*:*:*:*:*"
             )
-        checksum, checksum_algorithm = self.package_metadata.get_checksum(
-            version=version
-        )
-        if checksum is not None:
-            self.sbom_package.set_checksum(checksum_algorithm, checksum)
+        if source.get("checksum") is not None:
+            sbom_package.set_checksum(*source["checksum"])
+        elif not offline and remote_metadata["checksum"] is not None:
+            sbom_package.set_checksum(
+                remote_metadata["checksum_algorithm"], remote_metadata["checksum"]
+            )
         # Copyright
-        self.sbom_package.set_copyrighttext("NOASSERTION")
+        sbom_package.set_copyrighttext("NOASSERTION")
         # Store package data
-        self.sbom_packages[
+        package_info = sbom_package.get_package()
+        self._add_package(
             (
-                self.sbom_package.get_name(),
-                self.sbom_package.get_value("version"),
-            )
-        ] = self.sbom_package.get_package()
+                sbom_package.get_name(),
+                sbom_package.get_value("version"),
+            ),
+            package_info,
+        )
+        return package_info
 
     def _create_relationship(self, package, parent="-"):
-        self.sbom_relationship.initialise()
-        if parent != "-":
-            self.sbom_relationship.set_relationship(
-                parent.lower(), "DEPENDS_ON", package
+        sbom_relationship = SBOMRelationship()
+        if parent.lower() == package:
+            # Package requires extras of itself
+            return
+        elif parent != "-":
+            sbom_relationship.set_relationship(parent.lower(), "DEPENDS_ON", package)
+        else:
+            sbom_relationship.set_relationship(
+                self.parent, self.parent_relationship, package
             )
+        self._add_relationship(sbom_relationship.get_relationship())
+
+    def _add_file(self, file_info):
+        if self.writer is not None:
+            self.writer.add_file(file_info)
         else:
-            self.sbom_relationship.set_relationship(self.parent, "DESCRIBES", package)
-        self.sbom_relationships.append(self.sbom_relationship.get_relationship())
+            self.sbom_files[file_info["name"]] = file_info
+
+    def _add_package(self, package, package_info):
+        if self.writer is not None:
+            self.writer.add_package(package, package_info)
+        else:
+            self.sbom_packages[package] = package_info
+
+    def _add_relationship(self, relationship, deferred=False):
+        # Deferred relationships are reported once all pending packages have
+        # been created so that the order is the same when streaming
+        if self.writer is not None:
+            self.writer.add_relationship(relationship, deferred)
+        elif deferred:
+            self.deferred_relationships.append(relationship)
+        else:
+            self.sbom_relationships.append(relationship)
+
+    def _package_exists(self, package):
+        if self.writer is not None:
+            return self.writer.has_package(package)
+        return package in self.sbom_packages
 
     def analyze_code(self, filename):
         """Analyzes Python code for potential external service interactions.
@@ -309,170 +785,251 @@ class SBOMScanner:
             filename: The Python source file.
 
         Returns:
-            A list of potential external service interactions.
+            A list of potential external service interactions. Unless debugging,
+            analysis stops once the first interaction is found.
         """
-        potential_external_services = []
-        modules = ["requests", "urllib", "httplib2"]
-        potential_endpoint = []
+        with self.metrics.phase("service_analysis"):
+            return self._analyze_code(filename)
+
+    def _analyze_code(self, filename):
         try:
-            with open(filename, "r", errors="replace") as f:
+            with open(filename, "rb") as f:
                 source_code = f.read()
-            tree = ast.parse(source_code)
-
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Attribute):
-                    # Check for function calls on http libraries like requests or urllib
-                    if (
-                        isinstance(node.value, ast.Name)
-                        and (node.value.id in modules)
-                        and node.attr in ["get", "post", "put", "delete"]
-                    ):
-                        if [
-                            node.value.id,
-                            node.attr,
-                        ] not in potential_external_services:
-                            potential_external_services.append(
-                                [node.value.id, node.attr]
-                            )
-                elif isinstance(node, ast.Constant):
-                    if node.value is not None:
-                        constant = str(node.value)
-                        if (
-                            constant.startswith("http")
-                            and "//" in constant
-                            and len(constant) > 8
-                        ):
-                            # print (filename, constant)
-                            potential_endpoint.append(constant)
+            self.metrics.increment("bytes_read", len(source_code))
         except FileNotFoundError:
             print(f"[ERROR] {filename} not found")
-        except SyntaxError:
+            return []
+        except OSError:
+            # e.g. a directory
+            return []
+        # Only parse code which references a http library and an endpoint
+        if SERVICE_ENDPOINT not in source_code or not any(
+            m in source_code for m in SERVICE_MODULE_NAMES
+        ):
+            return []
+        # Results are cached as the same code may be included in many packages
+        digest = hashlib.sha256(source_code).hexdigest()
+        if digest in self.service_cache:
+            self.metrics.increment("service_cache_hits")
+            return self.service_cache[digest]
+        self.metrics.increment("service_cache_misses")
+        visitor = ServiceVisitor(stop_early=not self.debug)
+        try:
+            visitor.visit(ast.parse(source_code.decode("utf-8", errors="replace")))
+        except StopIteration:
+            # All required information found
+            pass
+        except (SyntaxError, ValueError):
             # print(f"[ERROR] Unable to process {filename}.")
             pass
-        if len(potential_external_services) > 0 and len(potential_endpoint) > 0:
+        if (
+            len(visitor.potential_external_services) > 0
+            and len(visitor.potential_endpoint) > 0
+        ):
             if self.debug:
                 print(f"Potential endpoint in {filename}")
-                for i in potential_endpoint:
-                    print(i)
-                for i in potential_external_services:
+                for i in visitor.potential_endpoint:
                     print(i)
-
-            return potential_endpoint
+                for i in visitor.potential_external_services:
+                    print(list(i))
+            endpoints = visitor.potential_endpoint
         else:
-            return []
+            endpoints = []
+        self.service_cache[digest] = endpoints
+        return endpoints
 
-    def _extract_package_name(self, requirement_string):
-        for i, char in enumerate(requirement_string):
-            # Ignore optional dependencies
-            if "extra" in requirement_string:
-                return ""
-            # Paqckage names only contain alphanumeric characters and -_
-            if not char.isalnum() and char not in ["-", "_"]:
-                return requirement_string[:i]
-        return requirement_string
+    def get_distribution_index(self):
+        return self._get_distribution_index()
 
-    def _extract_package_names(self, requirements_list):
-        return [self._extract_package_name(req) for req in requirements_list]
+    def set_distribution_index(self, distribution_index, python_version=None):
+        # Index of installed distributions may be reused from a previous scan
+        self.distribution_index = distribution_index
+        self.requirement_parser = None
+        if python_version is not None:
+            self.python_version = python_version
 
-    def _getpackage_metadata(self, module):
-        metadata = {}
-        if self.use_pip:
-            out = self.run_pip_cmd(("show", module))
-            for line in out:
-                entry = line.split(":")
-                # If: this line contain an non-empty entry delimited by ':'
-                if (len(entry) == 2) and (entry[1] and not (entry[1].isspace())):
-                    # Store all data after keyword
-                    metadata[entry[0]] = (
-                        line.split(f"{entry[0]}:", 1)[1].strip().rstrip("\n")
-                    )
-                elif len(entry) > 2:
-                    # Likely to include URL
-                    metadata[entry[0]] = (
-                        line.split(f"{entry[0]}:", 1)[1].strip().rstrip("\n")
-                    )
-        else:
-            try:
-                if self.debug:
-                    print(f"Retrieve metadata for {module}")
-                package_data = importlib_metadata.metadata(module)
-            except importlib_metadata.PackageNotFoundError:
-                if self.debug:
-                    print(f"Package Not Found : {module}")
-                package_data = []
-            if len(package_data) == 0:
-                if self.debug:
-                    print(f"Unable to retrieve metadata for {module}")
-                return metadata
-            package_metadata = dict(package_data)
-            if self.debug:
-                print(f"Package metadata for {module}")
-                for key, value in package_metadata.items():
-                    print(key, value)
-            # Store subset of metadata (same as pip show <module>)
-            for attribute in [
-                "Name",
-                "Version",
-                "Summary",
-                "Home-page",
-                "Author",
-                "Author-email",
-                "License",
-                "Download-URL",
-            ]:
-                if package_metadata.get(attribute) is not None:
-                    metadata[attribute] = package_metadata[attribute]
-            # License-Expresssion is preferred to License
-            if package_metadata.get("License-Expression") is not None:
-                metadata["License"] = package_metadata["License-Expression"]
-            # Project-URL (multiple)
-            if package_metadata.get("Project-URL"):
-                metadata["Project-URL"] = package_data.get_all("Project-URL")
-            # Requires-Dist (multiple)
-            if package_metadata.get("Requires-Dist"):
-                requires = package_data.get_all("Requires-Dist")
-            else:
-                requires = None
-            # Use classifier if no license
-            if metadata.get("License") is not None:
-                if metadata["License"] == "UNKNOWN":
-                    metadata["License"] = None
-                elif "see license" in metadata["License"].lower():
-                    # If license has text similar to 'see license file', reset
-                    metadata["License"] = None
-            if (
-                metadata.get("License") is None
-                and package_metadata.get("Classifier") is not None
-            ):
-                for i in package_data.get_all("Classifier"):
-                    if i.startswith("License"):
-                        # Extract license from classifier
-                        license_name = i.split("::")[-1].strip()
-                        if metadata.get("License") is None:
-                            metadata["License"] = license_name
-                        else:
-                            metadata[
-                                "License"
-                            ] = f'{metadata["License"]} AND {license_name}'
-            # Extract dependencies (if any)
-            if requires is not None:
-                # Find dependent packages
-                if self.debug:
-                    print(f"Dependencies for {module} - {requires}")
+    def _get_distribution_index(self):
+        # Index of installed distributions is built once and shared by scans
+        with self.index_lock:
+            if self.distribution_index is None:
+                self._load_distribution_index()
+        return self.distribution_index
 
-                package_names = self._extract_package_names(requires)
+    def _get_requirement_parser(self):
+        # Markers are evaluated for the environment of the interpreter being
+        # scanned which is reported when the distributions are indexed
+        if self.requirement_parser is None:
+            environment = None
+            if self.python_path is not None and self.site_packages is None:
+                environment = self._get_distribution_index().environment
+            self.requirement_parser = RequirementParser(
+                environment, self.extras, debug=self.debug
+            )
+        return self.requirement_parser
 
-                package_dependendents = ""
-                for name in package_names:
-                    # Ignore extra packages
-                    if len(name) > 0:
-                        package_dependendents = (
-                            package_dependendents + name.split(" ")[0] + ", "
-                        )
-                # Remove extra punctuation
-                metadata["Requires"] = package_dependendents[:-2]
+    def _load_distribution_index(self):
+        self.distribution_index = DistributionIndex(debug=self.debug)
+        with self.metrics.phase("distribution_index"):
+            if self.site_packages is not None:
+                self.distribution_index.load(path=[str(self.site_packages)])
+            elif self.use_pip:
+                self._load_pip_distributions()
+            elif self.python_path is not None:
+                self._load_interpreter_distributions()
             else:
-                metadata["Requires"] = ""
+                self.distribution_index.load()
+
+    def _load_pip_distributions(self):
+        # Retrieve metadata for all installed distributions with a single pip command
+        out = self.run_pip_cmd(("inspect",))
+        try:
+            report = json.loads("\n".join(out))
+        except json.JSONDecodeError:
+            report = None
+        if report is not None:
+            self._load_json_distributions(report)
+            return
+        # pip inspect is not available (requires pip 22.2 or later)
+        if self.debug:
+            print("Unable to use pip inspect. Using pip show")
+        modules = []
+        out = self.run_pip_cmd(("list",))
+        if len(out) > 0:
+            # Ignore headers in output stream
+            for m in out[2:]:
+                modules.append(m.split(" ")[0])
+        if len(modules) > 0:
+            self._parse_pip_show(self.run_pip_cmd(["show"] + modules))
+
+    def _load_interpreter_distributions(self):
+        # Retrieve metadata for all installed distributions by running a script
+        # within the specified Python interpreter
+        bootstrap = pathlib.Path(__file__).resolve().parent / "bootstrap.py"
+        out = self.run_program(
+            (str(self.python_path), "-c", bootstrap.read_text(encoding="utf-8"))
+        )
+        try:
+            report = json.loads("\n".join(out))
+        except json.JSONDecodeError:
+            # Script fails if importlib.metadata is not available (Python 3.7)
+            print(
+                f"[WARNING] Unable to retrieve metadata using {self.python_path}. "
+                "Using pip",
+                file=sys.stderr,
+            )
+            self._load_pip_distributions()
+            return
+        self._load_json_distributions(report)
+
+    def _load_json_distributions(self, report):
+        # Report format is compatible with pip inspect
+        environment = report.get("environment")
+        self.distribution_index.environment = environment
+        if report.get("python_version") is not None:
+            self.python_version = report["python_version"]
+        elif environment is not None and self.python_path is not None:
+            # Version of the interpreter reported by pip
+            self.python_version = environment.get(
+                "python_full_version", self.python_version
+            )
+        for distribution in report.get("installed", []):
+            location = distribution.get("location")
+            metadata_location = distribution.get("metadata_location")
+            if location is None and metadata_location is not None:
+                location = str(pathlib.Path(metadata_location).parent)
+            self.distribution_index.add_json(
+                distribution["metadata"], location, metadata_location
+            )
+
+    def _parse_pip_show(self, out):
+        # Output for each module is separated by ---
+        metadata = {}
+        for line in out + ["---"]:
+            if line.startswith("---"):
+                if len(metadata) > 0:
+                    if metadata.get("Requires") is not None:
+                        requires = metadata.pop("Requires")
+                        metadata["Requires-Dist"] = requires.split(",")
+                    self.distribution_index.add(metadata)
+                metadata = {}
+                continue
+            entry = line.split(":")
+            # If: this line contain an non-empty entry delimited by ':'
+            if (len(entry) == 2) and (entry[1] and not (entry[1].isspace())):
+                # Store all data after keyword
+                metadata[entry[0]] = (
+                    line.split(f"{entry[0]}:", 1)[1].strip().rstrip("\n")
+                )
+            elif len(entry) > 2:
+                # Likely to include URL
+                metadata[entry[0]] = (
+                    line.split(f"{entry[0]}:", 1)[1].strip().rstrip("\n")
+                )
+
+    def _getpackage_metadata(self, module):
+        metadata = {}
+        if self.debug:
+            print(f"Retrieve metadata for {module}")
+        package_metadata = self._get_distribution_index().get(module)
+        if package_metadata is None:
+            if self.debug:
+                print(f"Unable to retrieve metadata for {module}")
+            return metadata
+        if self.debug:
+            print(f"Package metadata for {module}")
+            for key, value in package_metadata.items():
+                print(key, value)
+        # Store subset of metadata (same as pip show <module>)
+        for attribute in [
+            "Name",
+            "Version",
+            "Summary",
+            "Home-page",
+            "Author",
+            "Author-email",
+            "License",
+            "Download-URL",
+            "Location",
+        ]:
+            if package_metadata.get(attribute) is not None:
+                metadata[attribute] = package_metadata[attribute]
+        # License-Expresssion is preferred to License
+        if package_metadata.get("License-Expression") is not None:
+            metadata["License"] = package_metadata["License-Expression"]
+        # Project-URL (multiple)
+        if package_metadata.get("Project-URL"):
+            metadata["Project-URL"] = package_metadata["Project-URL"]
+        # Requires-Dist (multiple)
+        requires = package_metadata.get("Requires-Dist")
+        # Use classifier if no license
+        if metadata.get("License") is not None:
+            if metadata["License"] == "UNKNOWN":
+                metadata["License"] = None
+            elif "see license" in metadata["License"].lower():
+                # If license has text similar to 'see license file', reset
+                metadata["License"] = None
+        if (
+            metadata.get("License") is None
+            and package_metadata.get("Classifier") is not None
+        ):
+            for i in package_metadata["Classifier"]:
+                if i.startswith("License"):
+                    # Extract license from classifier
+                    license_name = i.split("::")[-1].strip()
+                    if metadata.get("License") is None:
+                        metadata["License"] = license_name
+                    else:
+                        metadata[
+                            "License"
+                        ] = f'{metadata["License"]} AND {license_name}'
+        # Dependencies (if any). Markers are evaluated when the dependencies
+        # are traversed as the extras of the package are not yet known
+        if requires is not None:
+            if self.debug:
+                print(f"Dependencies for {module} - {requires}")
+            metadata["Requires"] = list(requires)
+        else:
+            metadata["Requires"] = []
         if self.debug:
             print(f"Metadata for {module} - {metadata}")
         return metadata
@@ -480,33 +1037,70 @@ class SBOMScanner:
     def process_module(self, module, parent="-"):
         if self.debug:
             print(f"Process Module {module}")
-        self.metadata = self._getpackage_metadata(module.strip())
+        module_key = normalise_name(module)
+        if module_key in self.resolved_modules:
+            # Module already visited so metadata is not retrieved again
+            package = self.resolved_modules[module_key]
+            if package is not None:
+                if self.debug:
+                    print(f"Already processed {package}")
+                self._create_relationship(package, parent)
+            return False
+        with self.metrics.phase("package_metadata"):
+            metadata = self._getpackage_metadata(module.strip())
         # If module not found, no metadata returned
-        if len(self.metadata) > 0:
-            package = self.get("Name").lower().replace("_", "-")
-            version = self.get("Version")
-            if (package, version) in self.sbom_packages:
+        if len(metadata) > 0:
+            package = self.get("Name", metadata).lower().replace("_", "-")
+            version = self.get("Version", metadata)
+            self.resolved_modules[module_key] = package
+            self.dependency_map[package] = metadata["Requires"]
+            if (
+                self._package_exists((package, version))
+                or (package, version) in self.pending_packages
+            ):
                 if self.debug:
                     print(f"Already processed {package} {version}")
-                # Prevent metadata being reprocessed
-                self.metadata = {}
-            else:
-                self._create_package(package, version, parent)
+                self._create_relationship(package, parent)
+                return False
+            # Package identifier as assigned by SBOMPackage
+            package_id = f"{package}_{version}"
+            previous = None
+            if self.state is not None:
+                previous = self._get_previous(module.strip(), package_id, parent)
+            self._queue_package(package, version, parent, metadata=metadata)
             self._create_relationship(package, parent)
             if self.include_file:
-                package = self.get("Name").lower().replace("-", "_")
-                directory_location = f'{self.get("Location")}/{package}'
-                file_dir = pathlib.Path(directory_location)
-                if self.debug:
-                    print(f"Directory for {package}: {file_dir}")
-                if file_dir.exists():
-                    filtered = [x for x in file_dir.glob("**/*")]
-                else:
-                    # Module is only a single file
-                    filtered = [pathlib.Path(f'{self.get("Location")}/{package}')]
+                package = self.get("Name", metadata).lower().replace("-", "_")
+                filtered = None
+                if previous is not None:
+                    # Files of unchanged distribution
+                    for file_info in previous["files"]:
+                        self.pending_files.append(
+                            (package, package_id, None, None, file_info)
+                        )
+                    filtered = []
+                elif self.use_record:
+                    filtered = self._get_recorded_files(module.strip())
+                if filtered is None:
+                    directory_location = f'{self.get("Location", metadata)}/{package}'
+                    file_dir = pathlib.Path(directory_location)
+                    if self.debug:
+                        print(f"Directory for {package}: {file_dir}")
+                    if file_dir.exists():
+                        filtered = [(x, None) for x in file_dir.glob("**/*")]
+                    else:
+                        # Module is only a single file
+                        filtered = [
+                            (
+                                pathlib.Path(
+                                    f'{self.get("Location", metadata)}/{package}'
+                                ),
+                                None,
+                            )
+                        ]
                 if self.debug:
                     print(f"Filenames: {filtered}")
-                for entry in filtered:
+                for entry, digest in filtered:
                     # Ignore compiled code
                     if str(entry).endswith(".pyc"):
                         continue
@@ -517,30 +1111,60 @@ class SBOMScanner:
                         if len(external_services) > 0:
                             print(f"External services in {entry}")
 
-                    if self.file_scanner.scan_file(entry):
-                        self.sbom_files[
-                            self.file_scanner.get_name()
-                        ] = self.file_scanner.get_file()
-                        # Add relationship
-                        self.sbom_relationship.initialise()
-                        self.sbom_relationship.set_relationship(
-                            package, "CONTAINS", self.file_scanner.get_name()
-                        )
-                        self.sbom_relationship.set_relationship_id(
-                            self.sbom_package.get_value("id"),
-                            self.file_scanner.get_value("id"),
-                        )
-                        self.sbom_relationship.set_target_type("file")
-                        self.sbom_relationships.append(
-                            self.sbom_relationship.get_relationship()
-                        )
-        elif self.debug:
-            print(f"Module {module} not found")
-        return len(self.metadata) > 0
+                    # Files are analysed once all packages have been found
+                    self.pending_files.append(
+                        (package, package_id, entry, digest, None)
+                    )
+                if len(self.pending_files) >= FILE_BATCH_SIZE:
+                    # Limit number of files held in memory
+                    self._analyse_files()
+        else:
+            self.resolved_modules[module_key] = None
+            if self.debug:
+                print(f"Module {module} not found")
+        return len(metadata) > 0
+
+    def _get_previous(self, module, package_id, parent):
+        # Returns analysis of distribution from previous scan if the
+        # distribution is unchanged. The version of Python is included in
+        # the fingerprint as it is reported for each package
+        fingerprint = self._get_distribution_index().get_fingerprint(module)
+        if fingerprint is not None:
+            fingerprint = f"{fingerprint}-{self.python_version}"
+        self.state.add_distribution(package_id, fingerprint)
+        previous = self.state.get_previous(package_id, fingerprint)
+        if previous is None or previous["application"] != (parent == "-"):
+            return None
+        if not previous["enriched"] and not self.offline:
+            # Retry retrieval of remote metadata
+            return None
+        if self.debug:
+            print(f"Distribution {package_id} unchanged")
+        self.previous_packages[package_id] = previous
+        return previous
+
+    def _get_recorded_files(self, module):
+        # Files listed in the RECORD file of the distribution together with
+        # the recorded SHA256 digest and size (if available)
+        distribution = self._get_distribution_index().get_distribution(module)
+        if distribution is None or distribution.files is None:
+            if self.debug:
+                print(f"No RECORD file available for {module}")
+            return None
+        files = []
+        for file in distribution.files:
+            filename = pathlib.Path(os.path.normpath(distribution.locate_file(file)))
+            digest = None
+            if file.hash is not None and file.hash.mode == "sha256":
+                # Digest is encoded as urlsafe base64 without padding
+                value = file.hash.value + "=" * (-len(file.hash.value) % 4)
+                digest = (base64.urlsafe_b64decode(value).hex(), file.size)
+            files.append((filename, digest))
+        return files
 
-    def get(self, attribute):
-        if self.metadata.get(attribute) is not None:
-            return self.metadata.get(attribute, "").lstrip()
+    def get(self, attribute, metadata):
+        if metadata.get(attribute) is not None:
+            return metadata.get(attribute, "").lstrip()
         return ""
 
     def get_files(self):
@@ -554,90 +1178,275 @@ class SBOMScanner:
             print(self.sbom_relationships)
         return self.sbom_relationships
 
+    def get_cache_info(self):
+        # Usage of the normalisation caches during the scan. Includes the
+        # usage by any concurrent scans sharing the normaliser
+        return self.normaliser.get_cache_info(self.normalisation_start)
+
+    def get_metrics(self):
+        # Include usage of normalisation caches
+        for name, info in self.get_cache_info().items():
+            self.metrics.set_counter(f"{name}_cache_hits", info["hits"])
+            self.metrics.set_counter(f"{name}_cache_misses", info["misses"])
+        return self.metrics
+
+    def get_unenriched(self):
+        # Number of packages for which remote metadata was not retrieved
+        # (e.g. because the network was unavailable)
+        return self.unenriched
+
+    def network_disabled(self):
+        # Indicates if remote metadata was disabled during the scan
+        return self.circuit_open
+
     def get_document(self):
         return self.sbom_document.get_document()
 
     def get_parent(self):
         return self.parent
 
+    def _get_dependencies(self, package, extras=()):
+        # Dependencies of the package which are active for the extras and
+        # have not already been traversed
+        expanded = self.expanded_extras.setdefault(package, [])
+        extras = [e for e in [""] + list(extras) if e not in expanded]
+        if len(extras) == 0:
+            return []
+        dependencies = self._get_requirement_parser().get_dependencies(
+            self.dependency_map[package], extras, list(expanded)
+        )
+        expanded.extend(extras)
+        return dependencies
+
     def analyze(self, parent, dependencies):
-        if len(dependencies) == 0:
-            return
-        else:
-            for r in dependencies.split(","):
-                if self.process_module(r, parent):
-                    self.analyze(r.strip(), self.get("Requires"))
+        # Iterative depth first traversal of the dependency graph. Each module
+        # is only expanded once (for each extra) but all of the dependencies
+        # are recorded. Dependencies are (module, extras)
+        stack = [(parent, module, extras) for module, extras in reversed(dependencies)]
+        while len(stack) > 0:
+            parent, module, extras = stack.pop()
+            if self.process_module(module, parent) or len(extras) > 0:
+                package = self.resolved_modules[normalise_name(module)]
+                if package is not None:
+                    stack.extend(
+                        (package, m, e)
+                        for m, e in reversed(self._get_dependencies(package, extras))
+                    )
+
+    def _analyze_module(self, module_name, extras=()):
+        self.analyze("-", [(module_name, tuple(extras))])
 
     def process_python_module(self, module_name):
         self.set_parent(module_name)
-        if self.process_module(module_name):
-            self.analyze(self.get("Name"), self.get("Requires"))
+        self._analyze_module(module_name, self._get_requirement_parser().extras)
+        self._flush_packages()
 
     def _get_installed_modules(self):
-        modules = []
-        if self.use_pip:
-            out = self.run_pip_cmd(("list",))
-            if len(out) > 0:
-                # Ignore headers in output stream
-                for m in out[2:]:
-                    modules.append(m.split(" ")[0])
-        else:
-            installed_packages_info = importlib_metadata.distributions()
-            # modules = sorted(
-            #     [p.metadata["Name"].lower() for p in installed_packages_info]
-            # )
-            modules = sorted([p.metadata["Name"] for p in installed_packages_info])
+        modules = self._get_distribution_index().get_names()
         if self.debug:
             print(modules)
         return modules
 
-    def process_system(self):
+    def identify_system(self, parent="system"):
+        # Identify all installed modules. Packages are not created until the
+        # scan is completed
         modules = self._get_installed_modules()
-        self.set_parent("system")
+        self.set_parent(parent)
         for module_name in modules:
-            if self.process_module(module_name):
-                self.analyze(self.get("Name"), self.get("Requires"))
+            self._analyze_module(module_name)
+
+    def complete_scan(self):
+        self._flush_packages()
+
+    def process_system(self):
+        self.identify_system()
+        self.complete_scan()
+
+    def scan(self, modules=None, requirements=None, system=False):
+        """Scans modules and requirements files or all installed modules.
+
+        The scanner is not modified so several scans can be performed
+        concurrently using the same scanner. The index of installed
+        distributions and the normalisation of metadata are shared by the
+        scans.
+
+        Args:
+            modules: Names of modules (may include wildcards).
+            requirements: Names of requirements files (may include wildcards).
+            system: Include all installed modules. Ignored if modules are
+                specified.
+
+        Returns:
+            A ScanResult.
+        """
+        modules = modules if modules is not None else []
+        requirements = requirements if requirements is not None else []
+        if len(modules) > 0 or system:
+            # Index is only built once for all scans
+            self._get_distribution_index()
+        self._get_requirement_parser()
+        scanner = copy.copy(self)
+        # Each scan has its own metrics but the hooks registered with the
+        # metrics of the scanner are called for every scan
+        scanner.metrics = Metrics()
+        scanner.metrics.hooks = self.metrics.hooks
+        scanner._initialise_scan()
+        try:
+            with scanner.metrics.phase("scan"):
+                if len(modules) > 0:
+                    scanner.process_inputs(modules, requirements)
+                elif system:
+                    scanner.process_system()
+                elif len(requirements) > 0:
+                    scanner.process_inputs([], requirements)
+        finally:
+            scanner.close()
+        return ScanResult(scanner)
+
+    def close(self):
+        # Release the worker processes used to analyse files
+        self.file_analyser.close()
 
     def process_requirements(self, filename):
+        self._add_requirements(filename, self._read_requirements(filename))
+        self._flush_packages()
+
+    def _find_modules(self, modules):
+        # Modules may include wildcards which are matched against the names of
+        # the installed modules
+        found = []
+        for module in modules:
+            if any(c in module for c in "*?["):
+                pattern = normalise_name(module)
+                matched = [
+                    name
+                    for name in self._get_installed_modules()
+                    if fnmatch.fnmatch(normalise_name(name), pattern)
+                ]
+                if self.debug:
+                    print(f"Modules matching {module}: {matched}")
+                if len(matched) == 0:
+                    print(f"[WARNING] No modules match {module}", file=sys.stderr)
+                found.extend(matched)
+            else:
+                found.append(module)
+        return list(dict.fromkeys(found))
+
+    def _find_files(self, filenames):
+        # Filenames may include wildcards
+        found = []
+        for filename in filenames:
+            if any(c in filename for c in "*?["):
+                matched = sorted(glob.glob(filename, recursive=True))
+                if self.debug:
+                    print(f"Files matching {filename}: {matched}")
+                if len(matched) == 0:
+                    print(f"[WARNING] No files match {filename}", file=sys.stderr)
+                found.extend(matched)
+            else:
+                found.append(filename)
+        return list(dict.fromkeys(found))
+
+    def process_inputs(self, modules=None, filenames=None):
+        # Process multiple modules and requirements files as a single SBOM.
+        # Each module and requirements file is described by the document
+        modules = self._find_modules(modules if modules is not None else [])
+        filenames = self._find_files(filenames if filenames is not None else [])
+        if len(modules) == 1 and len(filenames) == 0:
+            self.process_python_module(modules[0])
+            return
+        elif len(modules) == 0 and len(filenames) == 1:
+            self.process_requirements(filenames[0])
+            return
+        # Requirements files are read concurrently
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            requirements = list(executor.map(self._read_requirements, filenames))
+        self.set_parent("project")
+        document = self.parent
+        for module in modules:
+            self._analyze_module(module, self._get_requirement_parser().extras)
+        sbom_package = self._get_package_builder()
+        for filename, sections in zip(filenames, requirements):
+            # Each requirements file is reported as an application which
+            # depends on the requirements
+            self.set_parent(filename)
+            sbom_package.initialise()
+            sbom_package.set_name(self.parent)
+            sbom_package.set_type("application")
+            sbom_package.set_property("language", "Python")
+            sbom_package.set_evidence(filename)
+            self._add_package((self.parent, None), sbom_package.get_package())
+            sbom_relationship = SBOMRelationship()
+            sbom_relationship.set_relationship(document, "DESCRIBES", self.parent)
+            self._add_relationship(sbom_relationship.get_relationship())
+            self.parent_relationship = "DEPENDS_ON"
+            self._add_requirements(filename, sections)
+            self.parent_relationship = "DESCRIBES"
+        self.parent = document
+        self._flush_packages()
+
+    def _read_requirements(self, filename):
+        # Returns the sections of the requirements file. Each section is the
+        # lifecycle and a list of (requirement, package, dependencies of
+        # package, distribution recorded by lock file) for the section
         if filename.endswith(".toml"):
             # Could be a pyproject or pylock file
-            self.process_pyproject(filename)
-            self.process_pylock(filename)
+            return self._read_pyproject(filename) + self._read_pylock(filename)
         elif filename.endswith(".cfg"):
-            self.process_setup_cfg(filename)
+            return self._read_setup_cfg(filename)
         elif filename.endswith(".py"):
-            self.process_setup_py(filename)
+            return self._read_setup_py(filename)
         elif filename.endswith(".txt"):
-            self.process_requirements_file(filename)
+            return self._read_requirements_file(filename)
         elif filename.endswith(".lock"):
-            self.process_uvlock_file(filename)
+            return self._read_uvlock_file(filename)
         elif self.debug:
             print(f"Unable to process requirements file {filename}")
+        return []
 
-    def _process_requirement_dependency(self, dependency, filename):
+    def _add_requirements(self, filename, sections):
+        for lifecycle, requirements in sections:
+            self.set_lifecycle(lifecycle)
+            self.set_parent(filename)
+            for requirement, package, dependencies, source in requirements:
+                self._process_requirement_dependency(requirement, filename, source)
+                for dependency in dependencies:
+                    self._create_relationship(dependency, package)
+
+    def _process_requirement_dependency(self, dependency, filename, source=None):
         dependency = dependency.split("#")[0].strip()
         if len(dependency) > 0:
-            # Ignore anything after ; e.g. python_version<"3.8"
-            element = dependency.strip().split(";")[0]
-            # Check for pinned dependency
-            component = element.split("==")
-            if len(component) == 2:
-                # Package and version found
-                package = component[0]
-                version = component[1]
-                if self.debug:
-                    print(f"Processing {package} version {version}")
+            requirement = parse_requirement(dependency)
+            if requirement is not None:
+                # Requirements which are not installed in the environment
+                # (e.g. python_version<"3.8") are ignored
+                if not self._get_requirement_parser().is_active(dependency):
+                    return
+                package = requirement.name
+                version = pinned_version(requirement)
             else:
-                # Not pinned version
-                package = self._extract_package_name(element.split(" ")[0])
-                version = None
-                if self.debug:
+                print(
+                    f"[WARNING] Unable to process requirement {dependency} "
+                    f"in {filename}",
+                    file=sys.stderr,
+                )
+                return
+            if self.debug:
+                if version is not None:
+                    print(f"Processing {package} version {version}")
+                else:
                     print(f"Processing {package}")
-            self._create_package(package, version, requirements=filename)
+            if source is not None:
+                self.lock_sources[(package, version)] = source
+            self._queue_package(package, version, requirements=filename)
             self._create_relationship(package)
 
     def process_requirements_file(self, filename):
         # Process a requirements.txt file
+        self._add_requirements(filename, self._read_requirements_file(filename))
+        self._flush_packages()
+
+    def _read_requirements_file(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -645,13 +1454,39 @@ class SBOMScanner:
             if filePath.exists() and filePath.is_file():
                 with open(filename) as dir_file:
                     lines = dir_file.readlines()
-                self.set_lifecycle("pre-build")
-                self.set_parent(filename)
-                for line in lines:
-                    self._process_requirement_dependency(line, filename)
+                return [
+                    (
+                        "pre-build",
+                        [
+                            (line, None, [], None)
+                            for line in self._join_requirement_lines(lines)
+                        ],
+                    )
+                ]
+        return []
+
+    def _join_requirement_lines(self, lines):
+        # Requirements may be continued on following lines (e.g. output of
+        # pip-compile). Options (e.g. -r other-requirements.txt) and the options
+        # of each requirement (e.g. --hash) are ignored
+        requirement = ""
+        for line in lines + [""]:
+            line = REQUIREMENTS_COMMENT.sub("", line.rstrip())
+            if line.endswith("\\"):
+                requirement += line[:-1] + " "
+                continue
+            requirement = REQUIREMENT_OPTIONS.sub("", " " + requirement + line)
+            requirement = requirement.strip()
+            if len(requirement) > 0 and not requirement.startswith("-"):
+                yield requirement
+            requirement = ""
 
     def process_pyproject(self, filename):
         # Process pyproject.toml file
+        self._add_requirements(filename, self._read_pyproject(filename))
+        self._flush_packages()
+
+    def _read_pyproject(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -660,19 +1495,38 @@ class SBOMScanner:
                 with open(filename, "rb") as file:
                     pyproject_data = toml.load(file)
                     if "project" in pyproject_data:
-                        if "dependencies" in pyproject_data["project"]:
-                            dependencies = pyproject_data["project"]["dependencies"]
-                            if self.debug:
-                                print(dependencies)
-                            self.set_lifecycle("pre-build")
-                            self.set_parent(filename)
-                            for dependency in dependencies:
-                                self._process_requirement_dependency(
-                                    dependency, filename
+                        project = pyproject_data["project"]
+                        dependencies = project.get("dependencies", [])
+                        # Optional dependencies of the selected extras
+                        dependencies = dependencies + self._get_extra_requirements(
+                            project.get("optional-dependencies", {})
+                        )
+                        if self.debug:
+                            print(dependencies)
+                        if len(dependencies) > 0:
+                            return [
+                                (
+                                    "pre-build",
+                                    [(d, None, [], None) for d in dependencies],
                                 )
+                            ]
+        return []
+
+    def _get_extra_requirements(self, optional_dependencies):
+        # Requirements of each of the selected extras
+        requirements = []
+        extras = self._get_requirement_parser().extras
+        for extra, dependencies in optional_dependencies.items():
+            if normalise_name(extra) in extras:
+                requirements.extend(dependencies)
+        return requirements
 
     def process_setup_cfg(self, filename):
         # Process setup.cfg file
+        self._add_requirements(filename, self._read_setup_cfg(filename))
+        self._flush_packages()
+
+    def _read_setup_cfg(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -680,18 +1534,32 @@ class SBOMScanner:
             if filePath.exists() and filePath.is_file():
                 config = configparser.ConfigParser()
                 config.read(filename)
+                dependencies = []
                 if "options" in config.sections():
                     if "install_requires" in config["options"]:
-                        dependencies = config["options"]["install_requires"]
-                        if self.debug:
-                            print(dependencies)
-                        self.set_lifecycle("pre-build")
-                        self.set_parent(filename)
-                        for dependency in dependencies.splitlines():
-                            self._process_requirement_dependency(dependency, filename)
+                        dependencies = config["options"][
+                            "install_requires"
+                        ].splitlines()
+                if "options.extras_require" in config.sections():
+                    # Optional dependencies of the selected extras
+                    dependencies += self._get_extra_requirements(
+                        {
+                            extra: value.splitlines()
+                            for extra, value in config["options.extras_require"].items()
+                        }
+                    )
+                if self.debug:
+                    print(dependencies)
+                if len(dependencies) > 0:
+                    return [("pre-build", [(d, None, [], None) for d in dependencies])]
+        return []
 
     def process_setup_py(self, filename):
         # Process setup.py file
+        self._add_requirements(filename, self._read_setup_py(filename))
+        self._flush_packages()
+
+    def _read_setup_py(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -700,16 +1568,8 @@ class SBOMScanner:
                 dependencies = []
                 with open(filename, "r") as setup_file:
                     content = setup_file.read()
-                    # Read the file into a stream and search for list if dependencies specified by install_requires
-                    stream = content.replace("\n", "")
-                    match = re.search(r"install_requires\s*=\s*\[([^\]]+)\]", stream)
-                    if match:
-                        dependency_list = match.group(1).strip()
-                        dependencies = [
-                            dep.strip().replace('"', "").replace("'", "")
-                            for dep in dependency_list.split(",")
-                            if len(dep) > 0
-                        ]
+                    # Search for list of dependencies specified by install_requires
+                    dependencies = self._get_install_requires(content)
                     # Method 2: Handle multiline string with .split()
                     # Handles: install_requires = """package==1.0\npackage2>=2.0""".split()
                     # Also handles single quotes: install_requires = '''...'''.split()
@@ -730,13 +1590,46 @@ class SBOMScanner:
                             ]
                 if self.debug:
                     print(dependencies)
-                self.set_lifecycle("pre-build")
-                self.set_parent(filename)
-                for dependency in dependencies:
-                    self._process_requirement_dependency(dependency, filename)
+                return [("pre-build", [(d, None, [], None) for d in dependencies])]
+        return []
+
+    def _get_install_requires(self, content):
+        # Requirements in a list assigned to install_requires. The elements
+        # are evaluated so that quotes within requirements (e.g. markers) are
+        # retained
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.keyword) and node.arg == "install_requires":
+                value = node.value
+            elif isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == "install_requires"
+                for target in node.targets
+            ):
+                value = node.value
+            else:
+                continue
+            if not isinstance(value, (ast.List, ast.Tuple)):
+                continue
+            dependencies = []
+            for element in value.elts:
+                try:
+                    dependency = ast.literal_eval(element)
+                except ValueError:
+                    continue
+                if isinstance(dependency, str) and len(dependency.strip()) > 0:
+                    dependencies.append(dependency.strip())
+            return dependencies
+        return []
 
     def process_pylock(self, filename):
         # Process pylock.toml file
+        self._add_requirements(filename, self._read_pylock(filename))
+        self._flush_packages()
+
+    def _read_pylock(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -748,22 +1641,91 @@ class SBOMScanner:
                         if self.debug:
                             print(pylock_data)
                         if "packages" in pylock_data:
-                            self.set_lifecycle("pre-build")
-                            self.set_parent(filename)
-                            for package in pylock_data["packages"]:
-                                if "version" in package:
-                                    self._process_requirement_dependency(
-                                        f"{package['name']}=={package['version']}",
-                                        filename,
-                                    )
-                                    if "dependencies" in package:
-                                        for dependency in package["dependencies"]:
-                                            self._create_relationship(
-                                                dependency["name"], package["name"]
-                                            )
+                            return [
+                                (
+                                    "pre-build",
+                                    self._read_lock_packages(pylock_data["packages"]),
+                                )
+                            ]
+        return []
+
+    def _read_lock_packages(self, packages):
+        # Pinned version of each package together with its dependencies and
+        # the distribution recorded by the lock file
+        requirements = []
+        for package in packages:
+            if "version" in package:
+                requirements.append(
+                    (
+                        f"{package['name']}=={package['version']}",
+                        package["name"],
+                        [d["name"] for d in package.get("dependencies", [])],
+                        self._read_lock_source(package),
+                    )
+                )
+        return requirements
+
+    def _read_lock_source(self, package):
+        # Registry, download location, checksum and release date of a locked
+        # package (uv.lock or pylock.toml). The source distribution is
+        # preferred as wheels may be specific to a platform.
+        # None if not recorded
+        source = {}
+        registry = package.get("index")
+        if isinstance(package.get("source"), dict):
+            registry = package["source"].get("registry")
+        if registry is not None:
+            source["registry"] = registry
+        distributions = [package[d] for d in ["sdist", "archive"] if d in package]
+        for wheel in package.get("wheels", []):
+            name = wheel.get("name", wheel.get("url", "").split("/")[-1])
+            if name.endswith("-none-any.whl"):
+                distributions.append(wheel)
+        for distribution in distributions:
+            checksum = self._lock_checksum(distribution)
+            if checksum is not None:
+                source["checksum"] = checksum
+                if distribution.get("url") is not None:
+                    source["download_location"] = distribution["url"]
+                release_date = self._lock_time(distribution.get("upload-time"))
+                if release_date is not None:
+                    source["release_date"] = release_date
+                break
+        return source if len(source) > 0 else None
+
+    def _lock_checksum(self, distribution):
+        # uv.lock has a single hash (algorithm:value), pylock.toml has a table
+        # of hashes
+        hashes = dict(distribution.get("hashes", {}))
+        if ":" in distribution.get("hash", ""):
+            algorithm, value = distribution["hash"].split(":", 1)
+            hashes[algorithm] = value
+        for algorithm, checksum_algorithm in LOCK_CHECKSUM_ALGORITHMS.items():
+            if hashes.get(algorithm) is not None:
+                return checksum_algorithm, hashes[algorithm]
+        return None
+
+    def _lock_time(self, upload_time):
+        # Upload time is a TOML datetime (pylock.toml) or a string (uv.lock)
+        if isinstance(upload_time, str):
+            try:
+                upload_time = datetime.datetime.strptime(
+                    upload_time[:19], "%Y-%m-%dT%H:%M:%S"
+                )
+            except ValueError:
+                return None
+        if not isinstance(upload_time, datetime.datetime):
+            return None
+        if upload_time.tzinfo is not None:
+            upload_time = upload_time.astimezone(datetime.timezone.utc)
+        return upload_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
     def process_uvlock_file(self, filename):
         # Process uv.lock file
+        self._add_requirements(filename, self._read_uvlock_file(filename))
+        self._flush_packages()
+
+    def _read_uvlock_file(self, filename):
         if len(filename) > 0:
             # Check file exists
             filePath = pathlib.Path(filename)
@@ -774,15 +1736,7 @@ class SBOMScanner:
                     if self.debug:
                         print(uvlock_data)
                     if "package" in uvlock_data:
-                        self.set_lifecycle("build")
-                        self.set_parent(filename)
-                        for package in uvlock_data["package"]:
-                            if "version" in package:
-                                self._process_requirement_dependency(
-                                    f"{package['name']}=={package['version']}", filename
-                                )
-                                if "dependencies" in package:
-                                    for dependency in package["dependencies"]:
-                                        self._create_relationship(
-                                            dependency["name"], package["name"]
-                                        )
+                        return [
+                            ("build", self._read_lock_packages(uvlock_data["package"]))
+                        ]
+        return []
@@ -0,0 +1,724 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import argparse
+import glob
+import hmac
+import ipaddress
+import json
+import os
+import pathlib
+import signal
+import socketserver
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from sbom4python.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_TTL,
+    FileCache,
+    MemoryFileCache,
+    MemoryMetadataCache,
+    MetadataCache,
+)
+from sbom4python.normalise import MetadataNormaliser
+from sbom4python.version import VERSION
+
+SBOM_TYPES = ["spdx", "cyclonedx"]
+SBOM_FORMATS = ["tag", "json", "yaml"]
+CONTENT_TYPES = {
+    "tag": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "yaml": "application/yaml",
+}
+# Options of a scan request which are true or false
+SCAN_FLAGS = [
+    "system",
+    "include_file",
+    "exclude_license",
+    "include_service",
+    "use_pip",
+    "use_record",
+    "offline",
+    "refresh",
+]
+REQUEST_OPTIONS = [
+    "module",
+    "requirement",
+    "extra",
+    "environment",
+    "sbom",
+    "format",
+] + SCAN_FLAGS
+# Names of the local host which may be used to access the service
+LOOPBACK_HOSTS = ["localhost", "127.0.0.1", "::1"]
+# Environment variable containing the token required to access the service
+TOKEN_VARIABLE = "SBOM4PYTHON_TOKEN"
+
+
+def is_loopback(host):
+    if host in LOOPBACK_HOSTS:
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _host_name(host):
+    # Host header without the port
+    if host.startswith("["):
+        return host[1:].split("]")[0]
+    return host.split(":")[0]
+
+
+class ScanRequestError(Exception):
+    """
+    Invalid scan request.
+    """
+
+
+class SBOMService:
+    """
+    Generates SBOMs for scan requests. Information which is expensive to
+    obtain is retained between requests: the index of installed
+    distributions for each environment, remote metadata, license
+    normalisation and file analysis.
+    """
+
+    def __init__(
+        self,
+        debug=False,
+        jobs=1,
+        cache=None,
+        file_cache=None,
+        ttl=DEFAULT_CACHE_TTL,
+        offline=False,
+        max_failures=10,
+        network_budget=None,
+        environments=None,
+        requirement_dirs=None,
+    ):
+        self.debug = debug
+        self.jobs = max(1, jobs)
+        self.offline = offline
+        self.max_failures = max_failures
+        self.network_budget = network_budget
+        # Environments which may be scanned. Environments are only accessed
+        # if specified when the service is started
+        self.environments = {}
+        for environment in environments if environments is not None else []:
+            self.environments[self._environment_path(environment)] = environment
+        # Directories containing requirements files which may be scanned
+        self.requirement_dirs = [
+            self._requirement_path(directory)
+            for directory in (requirement_dirs if requirement_dirs is not None else [])
+        ]
+        self.normaliser = MetadataNormaliser()
+        self.metadata_cache = MemoryMetadataCache(ttl, cache=cache)
+        self.file_cache = MemoryFileCache(cache=file_cache)
+        self.lock = threading.Lock()
+        # (Distribution index, signature, python version) for each environment
+        self.indexes = {}
+        self.requests = 0
+        self.failures = 0
+        self.start_time = time.time()
+
+    def _get_list(self, request, name):
+        value = request.get(name, [])
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ScanRequestError(f"{name} must be a string or a list of strings")
+        return value
+
+    def _get_choice(self, request, name, choices, default):
+        value = request.get(name, default)
+        if value not in choices:
+            raise ScanRequestError(f"{name} must be one of {', '.join(choices)}")
+        return value
+
+    def parse_request(self, request):
+        # Validate scan request and apply defaults
+        if not isinstance(request, dict):
+            raise ScanRequestError("Scan request must be a JSON object")
+        unknown = set(request) - set(REQUEST_OPTIONS)
+        if len(unknown) > 0:
+            raise ScanRequestError(f"Unknown option {', '.join(sorted(unknown))}")
+        options = {
+            "module": self._get_list(request, "module"),
+            "requirement": self._get_list(request, "requirement"),
+            "extra": self._get_list(request, "extra"),
+            "environment": request.get("environment", ""),
+            "sbom": self._get_choice(request, "sbom", SBOM_TYPES, "spdx"),
+            "format": self._get_choice(request, "format", SBOM_FORMATS, "tag"),
+        }
+        if not isinstance(options["environment"], str):
+            raise ScanRequestError("environment must be a string")
+        for name in SCAN_FLAGS:
+            value = request.get(name, False)
+            if not isinstance(value, bool):
+                raise ScanRequestError(f"{name} must be true or false")
+            options[name] = value
+        options["offline"] = options["offline"] or self.offline
+        if (
+            len(options["module"]) == 0
+            and len(options["requirement"]) == 0
+            and not options["system"]
+            and len(options["environment"]) == 0
+        ):
+            raise ScanRequestError(
+                "One of module, requirement, system or environment must be specified"
+            )
+        # Only JSON format valid for CycloneDX
+        if options["sbom"] == "cyclonedx":
+            options["format"] = "json"
+        return options
+
+    def _environment_path(self, environment):
+        # Symbolic links are not resolved as the interpreter of a virtual
+        # environment is usually a link to the base interpreter
+        return pathlib.Path(os.path.abspath(os.path.expanduser(environment)))
+
+    def _environment(self, options):
+        # Environment is a Python interpreter or a directory of installed
+        # distributions (e.g. site-packages)
+        environment = options["environment"]
+        if len(environment) == 0:
+            return {}
+        # Only environments specified when the service was started are used
+        # as the interpreter of an environment is run by the service
+        path = self._environment_path(environment)
+        if path not in self.environments:
+            raise ScanRequestError(f"Environment {environment} not permitted")
+        environment = self.environments[path]
+        if path.is_dir():
+            return {"site_packages": environment}
+        if not path.exists():
+            raise ScanRequestError(f"Environment {environment} not found")
+        return {"python_path": environment}
+
+    def _requirement_path(self, requirement):
+        # Symbolic links are resolved so that a link within an allowed
+        # directory cannot be used to access other files
+        return pathlib.Path(os.path.realpath(os.path.expanduser(requirement)))
+
+    def _requirement_permitted(self, requirement):
+        path = self._requirement_path(requirement)
+        return any(
+            path == directory or directory in path.parents
+            for directory in self.requirement_dirs
+        )
+
+    def _requirements(self, options):
+        # Requirements files are only read from the directories specified when
+        # the service was started. Wildcards are expanded by the service so that
+        # every matching file can be checked
+        requirements = []
+        for requirement in options["requirement"]:
+            parts = pathlib.Path(os.path.expanduser(requirement)).parts
+            wildcard = [any(c in part for c in "*?[") for part in parts]
+            if True not in wildcard:
+                if not self._requirement_permitted(requirement):
+                    raise ScanRequestError(f"Requirement {requirement} not permitted")
+                requirements.append(requirement)
+                continue
+            # Directory which is searched for matching files
+            directory = os.path.join(*parts[: wildcard.index(True)] or ["."])
+            if not self._requirement_permitted(directory):
+                raise ScanRequestError(f"Requirement {requirement} not permitted")
+            matched = sorted(glob.glob(os.path.expanduser(requirement), recursive=True))
+            for filename in matched:
+                if not self._requirement_permitted(filename):
+                    raise ScanRequestError(f"Requirement {filename} not permitted")
+            if len(matched) == 0:
+                print(f"[WARNING] No files match {requirement}", file=sys.stderr)
+            requirements.extend(glob.escape(filename) for filename in matched)
+        return requirements
+
+    def _set_index(self, scanner, key, refresh):
+        with self.lock:
+            entry = self.indexes.get(key)
+        if entry is None or refresh:
+            return
+        index, signature, python_version = entry
+        if index.get_signature() != signature:
+            if self.debug:
+                print(f"Distributions in {key} changed")
+            return
+        scanner.set_distribution_index(index, python_version)
+
+    def _save_index(self, scanner, key):
+        index = scanner.get_distribution_index()
+        with self.lock:
+            self.indexes[key] = (index, index.get_signature(), scanner.python_version)
+
+    def scan(self, request):
+        # Returns the SBOM and the content type of the SBOM
+        from sbom4python.scanner import SBOMScanner
+
+        options = self.parse_request(request)
+        environment = self._environment(options)
+        requirements = self._requirements(options)
+        scanner = SBOMScanner(
+            self.debug,
+            include_file=options["include_file"],
+            exclude_license=options["exclude_license"],
+            include_service=options["include_service"],
+            use_pip=options["use_pip"],
+            use_record=options["use_record"],
+            jobs=self.jobs,
+            cache=self.metadata_cache,
+            file_cache=self.file_cache,
+            offline=options["offline"],
+            max_failures=self.max_failures,
+            network_budget=self.network_budget,
+            normaliser=self.normaliser,
+            extras=options["extra"],
+            **environment,
+        )
+        key = (
+            environment.get("site_packages"),
+            environment.get("python_path"),
+            options["use_pip"],
+        )
+        self._set_index(scanner, key, options["refresh"])
+        # All installed modules are included if no modules or requirements
+        # files are specified
+        system = len(options["module"]) == 0 and len(options["requirement"]) == 0
+        result = scanner.scan(options["module"], requirements, system)
+        if len(options["module"]) > 0 or system:
+            # Requirements files do not use the installed distributions
+            self._save_index(scanner, key)
+        sbom = self._generate(result, options)
+        with self.lock:
+            self.requests += 1
+        if self.debug:
+            result.metrics.report()
+        return sbom, CONTENT_TYPES[options["format"]]
+
+    def _generate(self, result, options):
+        from lib4sbom.generator import SBOMGenerator
+
+        sbom_gen = SBOMGenerator(
+            sbom_type=options["sbom"],
+            format=options["format"],
+            application="sbom4python",
+            version=VERSION,
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, f"sbom.{options['format']}")
+            with result.metrics.phase("generation"):
+                sbom_gen.generate(
+                    project_name=result.parent,
+                    sbom_data=result.get_sbom().get_sbom(),
+                    filename=filename,
+                )
+            with open(filename, "rb") as sbom_file:
+                return sbom_file.read()
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+
+    def get_status(self):
+        with self.lock:
+            environments = len(self.indexes)
+            requests = self.requests
+            failures = self.failures
+        return {
+            "version": VERSION,
+            "uptime": time.time() - self.start_time,
+            "requests": requests,
+            "failures": failures,
+            "environments": environments,
+            "metadata": len(self.metadata_cache),
+            "files": len(self.file_cache),
+            "normalisation": self.normaliser.get_cache_info(),
+        }
+
+
+class SBOMRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles requests to the SBOM service.
+
+    POST /scan generates an SBOM for the scan request (JSON)
+    GET /status reports the status of the service (JSON)
+    """
+
+    server_version = f"sbom4python/{VERSION}"
+    # Maximum size of a scan request
+    MAX_REQUEST_SIZE = 1024 * 1024
+
+    def address_string(self):
+        # Client address is not available for a Unix socket
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "local"
+
+    def log_message(self, format, *args):
+        if self.server.service.debug:
+            super().log_message(format, *args)
+
+    def _send(self, status, content, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode(), "application/json")
+
+    def _send_error(self, status, message, headers=None):
+        self._send(
+            status, json.dumps({"error": message}).encode(), "application/json", headers
+        )
+
+    def _check_access(self):
+        # Requests from a web browser (which include an origin) and requests
+        # to another host name (DNS rebinding) are rejected. Returns False if
+        # the request is rejected
+        if self.headers.get("Origin") is not None:
+            self._send_error(403, "Cross origin requests are not permitted")
+            return False
+        host = _host_name(self.headers.get("Host", ""))
+        allowed_hosts = self.server.allowed_hosts
+        if allowed_hosts is not None and host not in allowed_hosts:
+            self._send_error(403, f"Host {host} not permitted")
+            return False
+        token = self.server.token
+        if token is not None:
+            authorization = self.headers.get("Authorization", "")
+            if not hmac.compare_digest(
+                authorization.encode(), f"Bearer {token}".encode()
+            ):
+                self._send_error(
+                    401, "Invalid or missing token", {"WWW-Authenticate": "Bearer"}
+                )
+                return False
+        return True
+
+    def do_GET(self):
+        if not self._check_access():
+            return
+        if self.path == "/status":
+            self._send_json(200, self.server.service.get_status())
+        else:
+            self._send_error(404, f"{self.path} not found")
+
+    def do_POST(self):
+        if not self._check_access():
+            return
+        if self.path != "/scan":
+            self._send_error(404, f"{self.path} not found")
+            return
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type.lower() != "application/json":
+            self._send_error(415, "Content-Type must be application/json")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.MAX_REQUEST_SIZE:
+            self._send_error(400, "Invalid request length")
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+            sbom, content_type = self.server.service.scan(request)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.server.service.record_failure()
+            self._send_error(400, "Scan request must be a JSON object")
+        except ScanRequestError as ex:
+            self.server.service.record_failure()
+            self._send_error(400, str(ex))
+        except Exception as ex:
+            self.server.service.record_failure()
+            print(f"[ERROR] Scan failed - {ex}", file=sys.stderr)
+            self._send_error(500, f"Scan failed - {ex}")
+        else:
+            self._send(200, sbom, content_type)
+
+
+class WorkerPoolMixIn:
+    """
+    Requests are handled by a pool of worker threads.
+    """
+
+    workers = 4
+    # Token required to access the service (if any)
+    token = None
+    # Host names by which the service may be accessed (None if any host)
+    allowed_hosts = LOOPBACK_HOSTS
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def serve(self, service, workers):
+        self.service = service
+        with ThreadPoolExecutor(max_workers=workers) as self.executor:
+            try:
+                self.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                self.server_close()
+
+
+class SBOMHTTPServer(WorkerPoolMixIn, HTTPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class SBOMUnixServer(WorkerPoolMixIn, socketserver.UnixStreamServer):
+        def server_bind(self):
+            # Remove socket left by a previous server
+            path = pathlib.Path(self.server_address)
+            if path.is_socket():
+                path.unlink()
+            super().server_bind()
+
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+
+else:
+    SBOMUnixServer = None
+
+
+def _terminate(signum, frame):
+    # Server is stopped in the same way as an interrupt
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    argv = argv or sys.argv
+    app_name = "sbom4python serve"
+    parser = argparse.ArgumentParser(
+        prog=app_name,
+        description=textwrap.dedent(
+            """
+            Runs SBOM4Python as a service which generates SBOMs for scan requests
+            received over HTTP. Installed distributions, package metadata,
+            license normalisation and file analysis are retained between requests.
+            """
+        ),
+    )
+    server_group = parser.add_argument_group("Server")
+    server_group.add_argument(
+        "--host",
+        action="store",
+        default=None,
+        help="address on which to listen (default: 127.0.0.1)",
+    )
+    server_group.add_argument(
+        "--port",
+        action="store",
+        type=int,
+        default=None,
+        help="port on which to listen (default: 8080)",
+    )
+    server_group.add_argument(
+        "--socket",
+        action="store",
+        default=None,
+        help="Unix socket on which to listen instead of a port",
+    )
+    server_group.add_argument(
+        "--workers",
+        action="store",
+        type=int,
+        default=None,
+        help="number of requests processed concurrently (default: 4)",
+    )
+    server_group.add_argument(
+        "--token",
+        action="store",
+        default=None,
+        help="token which must be provided (as a bearer token) by each request. "
+        f"Required if HOST is not a loopback address (default: ${TOKEN_VARIABLE})",
+    )
+    server_group.add_argument(
+        "--allow-environment",
+        action="append",
+        default=[],
+        help="python interpreter or directory of installed python modules "
+        "(e.g. site-packages) which may be scanned. Can be specified multiple times",
+    )
+    server_group.add_argument(
+        "--allow-requirement",
+        action="append",
+        default=[],
+        help="directory containing requirements files which may be scanned. "
+        "Can be specified multiple times",
+    )
+    scan_group = parser.add_argument_group("Scan")
+    scan_group.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=None,
+        help="number of concurrent jobs for each scan (default: 4)",
+    )
+    scan_group.add_argument(
+        "--cache-dir",
+        action="store",
+        default=None,
+        help=f"directory for persistent caches (default: {DEFAULT_CACHE_DIR})",
+    )
+    scan_group.add_argument(
+        "--cache-ttl",
+        action="store",
+        type=int,
+        default=None,
+        help=f"days for which cached metadata is valid (default: {DEFAULT_CACHE_TTL})",
+    )
+    scan_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not use persistent caches. Results are only retained in memory",
+    )
+    scan_group.add_argument(
+        "--offline",
+        action="store_true",
+        help="do not retrieve metadata from the package registry",
+    )
+    scan_group.add_argument(
+        "--max-failures",
+        action="store",
+        type=int,
+        default=None,
+        help="number of registry failures before metadata retrieval is disabled "
+        "for a scan (default: 10)",
+    )
+    scan_group.add_argument(
+        "--network-budget",
+        action="store",
+        type=float,
+        default=None,
+        help="maximum time (seconds) spent retrieving metadata for a scan",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_true",
+        help="add debug information",
+    )
+    parser.add_argument("-V", "--version", action="version", version=VERSION)
+
+    defaults = {
+        "host": "127.0.0.1",
+        "port": 8080,
+        "socket": "",
+        "workers": 4,
+        "token": os.getenv(TOKEN_VARIABLE, ""),
+        "allow_environment": [],
+        "allow_requirement": [],
+        "jobs": 4,
+        "cache_dir": DEFAULT_CACHE_DIR,
+        "cache_ttl": DEFAULT_CACHE_TTL,
+        "no_cache": False,
+        "offline": False,
+        "max_failures": 10,
+        "network_budget": None,
+        "debug": False,
+    }
+
+    raw_args = parser.parse_args(argv[1:])
+    # Options which are not specified are None. Zero is a valid value
+    args = {key: value for key, value in vars(raw_args).items() if value is not None}
+    args = ChainMap(args, defaults)
+
+    if args["debug"]:
+        print("Host:", args["host"])
+        print("Port:", args["port"])
+        print("Socket:", args["socket"])
+        print("Workers:", args["workers"])
+        print("Token:", "Yes" if len(args["token"]) > 0 else "No")
+        print("Allowed environments:", args["allow_environment"])
+        print("Allowed requirements:", args["allow_requirement"])
+        print("Jobs:", args["jobs"])
+        print("Cache directory:", args["cache_dir"])
+        print("Cache TTL:", args["cache_ttl"])
+        print("No cache:", args["no_cache"])
+        print("Offline:", args["offline"])
+        print("Maximum failures:", args["max_failures"])
+        print("Network budget:", args["network_budget"])
+
+    if len(args["socket"]) == 0 and not is_loopback(args["host"]):
+        if len(args["token"]) == 0:
+            print(
+                f"[ERROR] A token is required to listen on {args['host']}. "
+                f"Specify --token or set {TOKEN_VARIABLE}"
+            )
+            return -1
+
+    metadata_cache = None
+    file_cache = None
+    if not args["no_cache"]:
+        metadata_cache = MetadataCache(
+            args["cache_dir"], args["cache_ttl"], debug=args["debug"]
+        )
+        file_cache = FileCache(args["cache_dir"], debug=args["debug"])
+
+    service = SBOMService(
+        debug=args["debug"],
+        jobs=args["jobs"],
+        cache=metadata_cache,
+        file_cache=file_cache,
+        ttl=args["cache_ttl"],
+        offline=args["offline"],
+        max_failures=args["max_failures"],
+        network_budget=args["network_budget"],
+        environments=args["allow_environment"],
+        requirement_dirs=args["allow_requirement"],
+    )
+
+    try:
+        if len(args["socket"]) > 0:
+            if SBOMUnixServer is None:
+                print("[ERROR] Unix sockets are not supported on this platform")
+                return -1
+            server = SBOMUnixServer(args["socket"], SBOMRequestHandler)
+            address = args["socket"]
+        else:
+            server = SBOMHTTPServer((args["host"], args["port"]), SBOMRequestHandler)
+            address = f"http://{args['host']}:{server.server_address[1]}"
+    except OSError as ex:
+        print(f"[ERROR] Unable to start server - {ex}")
+        return -1
+    if len(args["token"]) > 0:
+        server.token = args["token"]
+    if len(args["socket"]) == 0 and not is_loopback(args["host"]):
+        # Access is controlled by the token
+        server.allowed_hosts = None
+
+    print(f"{app_name} listening on {address}", flush=True)
+    signal.signal(signal.SIGTERM, _terminate)
+    server.serve(service, args["workers"])
+    for cache in [metadata_cache, file_cache]:
+        if cache is not None:
+            cache.close()
+    return 0
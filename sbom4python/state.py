@@ -0,0 +1,132 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import sys
+
+from sbom4python.store import FileStore
+from sbom4python.version import VERSION
+
+
+class ScanState:
+    """
+    State of a scan which is saved alongside the SBOM so that a subsequent
+    scan of the same environment only analyses the distributions which have
+    been added or changed. The state of a previous scan is only used if the
+    SBOM is unchanged and the scan used the same options.
+    """
+
+    def __init__(self, options, debug=False):
+        self.options = options
+        self.debug = debug
+        # Distributions from the previous scan keyed by package identifier
+        self.previous = {}
+        # Distributions from this scan keyed by package identifier
+        self.distributions = {}
+        self.files = FileStore()
+
+    def _state_filename(self, sbom_filename):
+        return f"{sbom_filename}.state.json"
+
+    def _digest(self, sbom_filename):
+        digest = hashlib.sha256()
+        try:
+            with open(sbom_filename, "rb") as sbom_file:
+                while True:
+                    data = sbom_file.read(1024 * 1024)
+                    if len(data) == 0:
+                        break
+                    digest.update(data)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def load(self, sbom_filename):
+        digest = self._digest(sbom_filename)
+        if digest is None:
+            if self.debug:
+                print(f"Previous SBOM {sbom_filename} not found")
+            return False
+        try:
+            with open(self._state_filename(sbom_filename)) as state_file:
+                state = json.load(state_file)
+        except (OSError, json.JSONDecodeError):
+            print(
+                f"[WARNING] No state available for {sbom_filename}. "
+                "All distributions are analysed",
+                file=sys.stderr,
+            )
+            return False
+        if state.get("version") != VERSION or state.get("options") != self.options:
+            print(
+                f"[WARNING] {sbom_filename} generated with different options. "
+                "All distributions are analysed",
+                file=sys.stderr,
+            )
+            return False
+        if state.get("digest") != digest:
+            print(
+                f"[WARNING] {sbom_filename} has been modified. "
+                "All distributions are analysed",
+                file=sys.stderr,
+            )
+            return False
+        self.previous = state.get("distributions", {})
+        if self.debug:
+            print(f"State of {len(self.previous)} distributions loaded")
+        return True
+
+    def get_previous(self, package_id, fingerprint):
+        # Analysis of distribution from previous scan if unchanged
+        previous = self.previous.pop(package_id, None)
+        if (
+            previous is None
+            or fingerprint is None
+            or previous["fingerprint"] != fingerprint
+        ):
+            return None
+        return previous
+
+    def add_distribution(self, package_id, fingerprint):
+        # Only distributions which can be fingerprinted are retained
+        if fingerprint is not None:
+            self.distributions[package_id] = {
+                "fingerprint": fingerprint,
+                "files": [],
+            }
+
+    def add_package(self, package_id, package_info, application, enriched):
+        distribution = self.distributions.get(package_id)
+        if distribution is not None:
+            distribution["package"] = package_info
+            distribution["application"] = application
+            distribution["enriched"] = enriched
+
+    def add_file(self, package_id, filename, file_info):
+        # Files are retained using the full filename
+        distribution = self.distributions.get(package_id)
+        if distribution is not None:
+            filename = str(filename)
+            self.files[filename] = dict(file_info, name=filename)
+            distribution["files"].append(filename)
+
+    def save(self, sbom_filename):
+        state = {
+            "version": VERSION,
+            "options": self.options,
+            "digest": self._digest(sbom_filename),
+            "distributions": {
+                package_id: dict(
+                    distribution,
+                    files=[self.files[f] for f in distribution["files"]],
+                )
+                for package_id, distribution in self.distributions.items()
+                if "package" in distribution
+            },
+        }
+        try:
+            with open(self._state_filename(sbom_filename), "w") as state_file:
+                json.dump(state, state_file)
+        except OSError:
+            print(f"[ERROR] Unable to save state for {sbom_filename}")
@@ -0,0 +1,249 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+# Attributes of a file which are stored individually
+FILE_ATTRIBUTES = [
+    "filetype",
+    "checksum",
+    "licenseinfoinfile",
+    "licenseconcluded",
+    "copyrighttext",
+]
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class FileRecord:
+    """
+    Compact representation of a file. Values which are common to many files
+    (e.g. file types, checksum algorithms and licenses) are shared and
+    checksums are held as binary digests.
+    """
+
+    __slots__ = ("name", "id", "digest") + tuple(FILE_ATTRIBUTES) + ("extra",)
+
+
+class FileStore(Mapping):
+    """
+    Files keyed by filename. Dictionaries of file data are only created
+    when a file is retrieved.
+    """
+
+    def __init__(self):
+        self.records = {}
+        # Shared instances of values (e.g. file types)
+        self.values_cache = {}
+
+    def _share(self, value):
+        return self.values_cache.setdefault(value, value)
+
+    def _set_checksum(self, record, checksums):
+        # Hexadecimal digests are concatenated and stored as bytes with the
+        # length of each digest. Any other values are stored unchanged
+        algorithms = []
+        digest = b""
+        for algorithm, value in checksums:
+            try:
+                value_digest = bytes.fromhex(value)
+                if value_digest.hex() == value:
+                    algorithms.append((sys.intern(algorithm), len(value_digest)))
+                    digest += value_digest
+                    continue
+            except (TypeError, ValueError):
+                pass
+            algorithms.append((sys.intern(algorithm), value))
+        record.checksum = self._share(tuple(algorithms))
+        record.digest = digest
+
+    def _get_checksum(self, record):
+        checksums = []
+        position = 0
+        for algorithm, value in record.checksum:
+            if isinstance(value, int):
+                checksums.append(
+                    [algorithm, record.digest[position : position + value].hex()]
+                )
+                position += value
+            else:
+                checksums.append([algorithm, value])
+        return checksums
+
+    def __setitem__(self, filename, file_info):
+        record = FileRecord()
+        # Filename is normally the name of the file so is only held once
+        record.name = filename if filename == file_info["name"] else file_info["name"]
+        record.id = file_info.get("id")
+        record.digest = None
+        for name in FILE_ATTRIBUTES:
+            value = file_info.get(name)
+            if name == "checksum" and value is not None:
+                self._set_checksum(record, value)
+            elif isinstance(value, list):
+                setattr(record, name, self._share(tuple(_intern(v) for v in value)))
+            else:
+                setattr(record, name, _intern(value))
+        extra = tuple(
+            (sys.intern(name), _intern(value))
+            for name, value in file_info.items()
+            if name not in FILE_ATTRIBUTES and name not in ["name", "id"]
+        )
+        try:
+            record.extra = self._share(extra) if len(extra) > 0 else None
+        except TypeError:
+            # Unhashable value
+            record.extra = extra
+        self.records[filename] = record
+
+    def _to_dict(self, record):
+        file_info = {"name": record.name}
+        if record.id is not None:
+            file_info["id"] = record.id
+        for name in FILE_ATTRIBUTES:
+            value = getattr(record, name)
+            if value is None:
+                continue
+            if name == "checksum":
+                file_info[name] = self._get_checksum(record)
+            elif isinstance(value, tuple):
+                file_info[name] = list(value)
+            else:
+                file_info[name] = value
+        if record.extra is not None:
+            file_info.update(record.extra)
+        return file_info
+
+    def __getitem__(self, filename):
+        return self._to_dict(self.records[filename])
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, filename):
+        return filename in self.records
+
+
+class RelationshipStore(Sequence):
+    """
+    Relationships stored as columns of identifiers of strings. Dictionaries
+    of relationship data are only created when a relationship is retrieved.
+    Duplicate relationships are ignored and relationships are indexed by
+    source and target.
+    """
+
+    # Columns in the order of the attributes of a relationship
+    COLUMNS = ["source", "type", "target", "source_id", "target_id"]
+    OPTIONAL_COLUMNS = ["source_type", "target_type"]
+
+    def __init__(self):
+        self.strings = []
+        self.string_index = {}
+        self.columns = {
+            name: array("i") for name in self.COLUMNS + self.OPTIONAL_COLUMNS
+        }
+        # Relationships keyed on the identifiers of all attributes
+        self.index = {}
+        # Positions of relationships keyed on the identifier of the source
+        # and of the target
+        self.sources = {}
+        self.targets = {}
+
+    def _string_id(self, value):
+        # None is stored as -1
+        if value is None:
+            return -1
+        string_id = self.string_index.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.string_index[value] = string_id
+        return string_id
+
+    def _key(self, relationship):
+        # Identifiers of the attributes of a relationship. None if any value
+        # has not been stored
+        key = []
+        for name in self.COLUMNS + self.OPTIONAL_COLUMNS:
+            value = relationship.get(name)
+            if value is None:
+                key.append(-1)
+            elif value in self.string_index:
+                key.append(self.string_index[value])
+            else:
+                return None
+        return tuple(key)
+
+    def append(self, relationship):
+        # Returns False if the relationship is already present
+        key = tuple(
+            self._string_id(relationship.get(name))
+            for name in self.COLUMNS + self.OPTIONAL_COLUMNS
+        )
+        if key in self.index:
+            return False
+        position = len(self)
+        self.index[key] = position
+        self.sources.setdefault(key[0], array("i")).append(position)
+        self.targets.setdefault(key[2], array("i")).append(position)
+        for name, string_id in zip(self.COLUMNS, key):
+            self.columns[name].append(string_id)
+        for name, string_id in zip(self.OPTIONAL_COLUMNS, key[len(self.COLUMNS) :]):
+            # Attribute is omitted if not present
+            self.columns[name].append(string_id + 1)
+        return True
+
+    def extend(self, relationships):
+        for relationship in relationships:
+            self.append(relationship)
+
+    def _find(self, positions, name, relationship_type):
+        string_id = self.string_index.get(name)
+        if string_id is None:
+            return []
+        relationships = [self[position] for position in positions.get(string_id, [])]
+        if relationship_type is not None:
+            relationships = [r for r in relationships if r["type"] == relationship_type]
+        return relationships
+
+    def get_outgoing(self, source, relationship_type=None):
+        # Relationships from source (optionally of the specified type)
+        return self._find(self.sources, source, relationship_type)
+
+    def get_incoming(self, target, relationship_type=None):
+        # Relationships to target (optionally of the specified type)
+        return self._find(self.targets, target, relationship_type)
+
+    def __contains__(self, relationship):
+        if not isinstance(relationship, Mapping):
+            return False
+        key = self._key(relationship)
+        return key is not None and key in self.index
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        relationship = {}
+        for name in self.COLUMNS:
+            string_id = self.columns[name][position]
+            relationship[name] = self.strings[string_id] if string_id >= 0 else None
+        for name in self.OPTIONAL_COLUMNS:
+            string_id = self.columns[name][position] - 1
+            if string_id >= 0:
+                relationship[name] = self.strings[string_id]
+        return relationship
+
+    def __len__(self):
+        return len(self.columns["source"])
+
+    def __repr__(self):
+        return repr(list(self))
@@ -0,0 +1,345 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import sys
+import tempfile
+
+from lib4sbom.generator import SBOMGenerator
+
+
+class _Spool:
+    """
+    Temporary file holding the formatted elements of one section of an SBOM.
+    """
+
+    def __init__(self, separator):
+        self.separator = separator
+        self.file = None
+        self.count = 0
+
+    def write(self, text):
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+        elif len(self.separator) > 0:
+            self.file.write(self.separator)
+        self.file.write(text)
+        self.count += 1
+
+    def copy(self, output):
+        if self.file is not None:
+            self.file.seek(0)
+            while True:
+                data = self.file.read(1024 * 1024)
+                if len(data) == 0:
+                    break
+                output.write(data)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SBOMWriter:
+    """
+    Writes an SBOM incrementally as files, packages and relationships are
+    identified rather than generating the SBOM once all of the data has been
+    collected. Elements are formatted as they are added and written to
+    temporary files; only the identity of each element is retained for
+    resolving relationships. The SBOM is identical to that produced by
+    lib4sbom. Supports SPDX (tag and JSON) and CycloneDX (JSON) formats.
+
+    The elements are formatted using the internals of the lib4sbom generator
+    so the supported versions of lib4sbom are restricted in requirements.txt.
+    """
+
+    def __init__(
+        self,
+        sbom_type="spdx",
+        format="tag",
+        filename="",
+        application="sbom4python",
+        version="",
+        debug=False,
+    ):
+        self.generator = SBOMGenerator(
+            sbom_type=sbom_type, format=format, application=application, version=version
+        )
+        self.bom = self.generator.bom
+        self.sbom_type = self.generator.get_type()
+        self.format = self.generator.get_format()
+        if self.format not in ["tag", "json"]:
+            raise ValueError(f"Streaming not supported for {self.format} format")
+        self.filename = filename
+        self.debug = debug
+        # Element name to list of (identifier, package identifier)
+        self.element_set = {}
+        self.files = set()
+        self.packages = set()
+        separator = "\n" if self.format == "tag" else ",\n"
+        self.file_spool = _Spool(separator)
+        self.package_spool = _Spool(separator)
+        self.relationship_spool = _Spool("\n")
+        self.deferred_spool = _Spool("\n")
+
+    def _json(self, data, level=2):
+        # Same layout as the complete document (indent of 2) at specified level
+        return "  " * level + json.dumps(data, indent=2).replace(
+            "\n", "\n" + "  " * level
+        )
+
+    def _save_element(self, name, id, id2=None):
+        self.element_set.setdefault(name, []).append((id, id2))
+
+    def has_package(self, package):
+        # Package is (name, version)
+        return package in self.packages
+
+    def add_file(self, file_info):
+        # Duplicate files are ignored
+        if file_info["name"] in self.files:
+            return
+        self.files.add(file_info["name"])
+        position = len(self.files)
+        file_id = file_info["id"]
+        if self.sbom_type == "spdx":
+            if file_id == "NOT_DEFINED" or not self.generator._validate_id(file_id):
+                file_id = f"{position}-{file_info['name']}"
+            self.bom.generateFileDetails(
+                file_info["name"], file_id, file_info, self.bom.SPDX_PROJECT_ID, ""
+            )
+            if self.format == "tag":
+                self.file_spool.write("\n".join(self.bom.doc))
+                self.bom.doc = []
+            else:
+                self.file_spool.write(self._json(self.bom.file_component.pop()))
+        else:
+            if file_id == "NOT_DEFINED":
+                file_id = f"{position}-{file_info['name']}"
+            self.bom.generateComponent(file_id, "file", file_info)
+            self.file_spool.write(self._json(self.bom.component.pop()))
+        self._save_element(file_info["name"], file_id)
+
+    def add_package(self, package, package_info):
+        # Package is (name, version). Duplicate packages are ignored
+        if package in self.packages or "name" not in package_info:
+            return
+        self.packages.add(package)
+        position = len(self.packages)
+        product = package_info["name"]
+        my_id = None
+        if self.sbom_type == "cyclonedx":
+            my_id = package_info.get("bom-ref")
+        if my_id is None:
+            my_id = package_info.get("id")
+            if not self.generator._validate_id(my_id):
+                my_id = f"{position}-{product}"
+        self._save_element(product, my_id, my_id)
+        if self.sbom_type == "spdx":
+            self.bom.generatePackageDetails(
+                product, my_id, package_info, self.bom.SPDX_PROJECT_ID, "DESCRIBES"
+            )
+            if self.format == "tag":
+                self.package_spool.write("\n".join(self.bom.doc))
+                self.bom.doc = []
+            else:
+                self.package_spool.write(self._json(self.bom.component.pop()))
+        else:
+            self.bom.generateComponent(my_id, "library", package_info)
+            self.package_spool.write(self._json(self.bom.component.pop()))
+
+    def add_relationship(self, relationship, deferred=False):
+        # Relationships are resolved once all elements are known. Deferred
+        # relationships are reported following the next commit
+        if deferred:
+            self.deferred_spool.write(json.dumps(relationship))
+        else:
+            self.relationship_spool.write(json.dumps(relationship))
+
+    def commit(self):
+        # Report deferred relationships
+        if self.deferred_spool.file is not None:
+            self.deferred_spool.file.write("\n")
+            self.deferred_spool.file.seek(0)
+            for line in self.deferred_spool.file:
+                self.relationship_spool.write(line.rstrip("\n"))
+            self.deferred_spool.close()
+            self.deferred_spool.count = 0
+
+    def _relationships(self):
+        if self.relationship_spool.file is None:
+            return
+        self.relationship_spool.file.write("\n")
+        self.relationship_spool.file.seek(0)
+        for line in self.relationship_spool.file:
+            yield json.loads(line)
+
+    def _header(self, project_name, document):
+        # Document header is generated by lib4sbom. User defined licenses
+        # are reported after the packages
+        license_info = getattr(self.bom, "license_info", [])
+        self.bom.license_info = []
+        self.generator.generate(
+            project_name, {"document": document}, send_to_output=False
+        )
+        self.bom.license_info = license_info
+        header = self.generator.get_sbom()
+        # Include document in the set of elements
+        for name, ids in self.element_set.items():
+            self.generator.element_set.setdefault(name, []).extend(ids)
+        self.element_set = self.generator.element_set
+        if self.format == "tag":
+            # Remove relationship section
+            return header[:-1]
+        for key in ["hasExtractedLicensingInfos", "files", "packages", "relationships"]:
+            header.pop(key, None)
+        return header
+
+    def _spdx_relationships(self):
+        generated = set()
+        for relationship in self._relationships():
+            if (
+                relationship["source"] not in self.element_set
+                or relationship["target"] not in self.element_set
+            ):
+                if self.debug:
+                    print(
+                        "[ERROR] Relationship not copied between",
+                        relationship["source"],
+                        " and ",
+                        relationship["target"],
+                    )
+                continue
+            identities = []
+            for element in ["source", "target"]:
+                id = self.generator._get_element(
+                    relationship[element], relationship.get(f"{element}_id")
+                )
+                if relationship.get(f"{element}_type") == "file":
+                    identities.append(self.bom.file_ident(id))
+                else:
+                    identities.append(self.bom.package_ident(id))
+            relation = (identities[0], identities[1], relationship["type"].strip())
+            if relation[0] != relation[1] and relation not in generated:
+                generated.add(relation)
+                yield relation
+
+    def _cyclonedx_dependencies(self):
+        dependencies = {}
+        for relationship in self._relationships():
+            parent_id = self.generator._get_element(
+                relationship["source"], relationship.get("source_id")
+            )
+            package_id = self.generator._get_element(
+                relationship["target"], relationship.get("target_id")
+            )
+            if parent_id is None or package_id is None or parent_id == package_id:
+                continue
+            if parent_id not in dependencies:
+                dependencies[parent_id] = {}
+            dependencies[parent_id][package_id] = True
+        return [
+            {"ref": ref, "dependsOn": list(depends)}
+            for ref, depends in dependencies.items()
+        ]
+
+    def _write_tag(self, output, header):
+        for line in header:
+            output.write(line + "\n")
+        for spool in [self.file_spool, self.package_spool]:
+            if spool.count > 0:
+                spool.copy(output)
+                output.write("\n")
+        # User defined licenses
+        self.bom.doc = []
+        self.bom.generateLicenseDetails()
+        self.bom.generateComment("\n")
+        for line in self.bom.doc:
+            output.write(line + "\n")
+        for source, target, relationship_type in self._spdx_relationships():
+            output.write(f"Relationship: {source} {relationship_type} {target}\n")
+
+    def _write_array(self, output, key, spool):
+        if spool.count == 0:
+            output.write(f'  "{key}": []')
+        else:
+            output.write(f'  "{key}": [\n')
+            spool.copy(output)
+            output.write("\n  ]")
+
+    def _write_json(self, output, header):
+        output.write("{\n")
+        output.write(
+            ",\n".join(
+                f"  {json.dumps(k)}: {self._json(v, 1)[2:]}" for k, v in header.items()
+            )
+        )
+        if self.sbom_type == "spdx":
+            self.bom.licenses = []
+            self.bom.generateLicenseDetails()
+            if len(self.bom.licenses) > 0:
+                output.write(",\n")
+                output.write(
+                    '  "hasExtractedLicensingInfos": '
+                    + self._json(self.bom.licenses, 1)[2:]
+                )
+            if self.file_spool.count > 0:
+                output.write(",\n")
+                self._write_array(output, "files", self.file_spool)
+            output.write(",\n")
+            self._write_array(output, "packages", self.package_spool)
+            relationships = _Spool(",\n")
+            for source, target, relationship_type in self._spdx_relationships():
+                relationships.write(
+                    self._json(
+                        {
+                            "spdxElementId": source,
+                            "relatedSpdxElement": target,
+                            "relationshipType": relationship_type,
+                        }
+                    )
+                )
+            output.write(",\n")
+            self._write_array(output, "relationships", relationships)
+            relationships.close()
+        else:
+            if self.file_spool.count + self.package_spool.count > 0:
+                output.write(",\n")
+                output.write('  "components": [\n')
+                self.file_spool.copy(output)
+                if self.file_spool.count > 0 and self.package_spool.count > 0:
+                    output.write(",\n")
+                self.package_spool.copy(output)
+                output.write("\n  ]")
+            dependencies = self._cyclonedx_dependencies()
+            if len(dependencies) > 0:
+                output.write(",\n")
+                output.write('  "dependencies": ' + self._json(dependencies, 1)[2:])
+        output.write("\n}\n")
+
+    def close(self, project_name, document):
+        # Generate the SBOM
+        self.commit()
+        if project_name == "":
+            project_name = "Default_project"
+        header = self._header(project_name, document)
+        if len(self.filename) > 0:
+            output = open(self.filename, "w", encoding="utf-8")
+        else:
+            output = sys.stdout
+        try:
+            if self.format == "tag":
+                self._write_tag(output, header)
+            else:
+                self._write_json(output, header)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            for spool in [
+                self.file_spool,
+                self.package_spool,
+                self.relationship_spool,
+                self.deferred_spool,
+            ]:
+                spool.close()
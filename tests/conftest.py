@@ -0,0 +1,23 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import pathlib
+import sys
+
+import pytest
+
+# The fake package registry is shared with the benchmarks
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from fake_registry import FakeRegistry, redirect_registry  # noqa: E402
+
+
+@pytest.fixture
+def registry():
+    # Package registry which counts the requests made
+    with FakeRegistry() as registry:
+        restore = redirect_registry(registry.get_url())
+        try:
+            yield registry
+        finally:
+            restore()
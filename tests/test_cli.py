@@ -0,0 +1,16 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from sbom4python.cli import main
+
+
+@pytest.mark.parametrize(
+    "options", [["--python", "{}", "--module", "pip"], ["--environment", "{}"]]
+)
+def test_missing_interpreter(options, tmp_path, capsys):
+    interpreter = str(tmp_path / "python")
+    argv = ["sbom4python"] + [option.format(interpreter) for option in options]
+    assert main(argv) == -1
+    assert f"Python interpreter {interpreter} not found" in capsys.readouterr().out
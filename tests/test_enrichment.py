@@ -0,0 +1,49 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from sbom4python.cli import main
+from sbom4python.scanner import SBOMScanner
+
+PACKAGES = 42
+
+
+@pytest.mark.parametrize("jobs", [1, 8])
+def test_unenriched_packages(registry, tmp_path, jobs):
+    # All lookups fail so that remote metadata is disabled part way through
+    # the scan
+    registry.unknown_ratio = 1.0
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text(
+        "".join(f"unknown-package-{n}=={n}.0\n" for n in range(PACKAGES))
+    )
+    scanner = SBOMScanner(False, jobs=jobs, max_failures=3)
+    result = scanner.scan(requirements=[str(requirements)])
+    assert result.network_disabled
+    assert result.unenriched == PACKAGES
+
+
+@pytest.mark.parametrize(
+    "limits", [{"max_failures": 0}, {"network_budget": 0}, {"network_budget": 0.0}]
+)
+def test_zero_limits(registry, tmp_path, limits):
+    # Remote metadata is disabled before any lookup
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests==2.31.0\n")
+    scanner = SBOMScanner(False, **limits)
+    result = scanner.scan(requirements=[str(requirements)])
+    assert registry.requests == 0
+    assert result.network_disabled
+    assert result.unenriched == 1
+
+
+@pytest.mark.parametrize("option", ["--max-failures", "--network-budget"])
+def test_zero_limits_cli(registry, tmp_path, capsys, option):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests==2.31.0\n")
+    argv = ["sbom4python", "-r", str(requirements), "--no-cache", option, "0"]
+    argv += ["-o", str(tmp_path / "sbom.spdx")]
+    assert main(argv) == 0
+    assert registry.requests == 0
+    assert "Metadata not retrieved for 1 packages" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import textwrap
+
+from sbom4python.scanner import SBOMScanner
+
+PACKAGES = 20
+
+
+def write_pylock(path, upload_time=True):
+    lock = 'lock-version = "1.0"\ncreated-by = "test"\n'
+    for number in range(PACKAGES):
+        name = f"locked-package-{number}"
+        lock += textwrap.dedent(
+            f"""
+            [[packages]]
+            name = "{name}"
+            version = "1.{number}"
+            index = "https://pypi.org/simple"
+
+            [[packages.wheels]]
+            name = "{name}-1.{number}-py3-none-any.whl"
+            url = "https://files.pythonhosted.org/packages/{name}.whl"
+            hashes = {{ sha256 = "{number:064x}" }}
+            """
+        )
+        if upload_time:
+            lock += "upload-time = 2025-03-13T11:10:21Z\n"
+    path.write_text(lock)
+    return str(path)
+
+
+def scan(filename):
+    scanner = SBOMScanner(False, jobs=4)
+    return scanner.scan(requirements=[filename])
+
+
+def test_locked_packages_not_retrieved_by_version(registry, tmp_path):
+    result = scan(write_pylock(tmp_path / "pylock.toml"))
+    # Only the metadata of the project is retrieved for each package
+    assert registry.requests == PACKAGES
+    package = result.packages[("locked-package-1", "1.1")]
+    assert package["checksum"] == [["SHA256", f"{1:064x}"]]
+    assert package["licenseconcluded"] == "MIT"
+    assert package["supplier"] == "Example Organisation (dev@example.org)"
+
+
+def test_packages_without_upload_time_retrieved_by_version(registry, tmp_path):
+    scan(write_pylock(tmp_path / "pylock.toml", upload_time=False))
+    assert registry.requests == 2 * PACKAGES
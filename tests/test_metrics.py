@@ -0,0 +1,39 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+from sbom4python.metrics import Metrics
+from sbom4python.scanner import SBOMScanner
+
+
+def normalisation_counters(result):
+    return {
+        name: value
+        for name, value in result.metrics.counters.items()
+        if name.split("_")[0] in ["license", "deprecated", "supplier"]
+    }
+
+
+def test_normalisation_counters_per_scan():
+    scanner = SBOMScanner(False, offline=True)
+    first = normalisation_counters(scanner.scan(modules=["pip"]))
+    second = normalisation_counters(scanner.scan(modules=["pip"]))
+    assert first["license_cache_misses"] > 0
+    # Normalisation is retained between scans so the second scan only
+    # reports cache hits
+    assert second["license_cache_misses"] == 0
+    assert second["license_cache_hits"] == (
+        first["license_cache_hits"] + first["license_cache_misses"]
+    )
+
+
+def test_hooks_called_by_scan():
+    events = []
+    metrics = Metrics()
+    metrics.add_hook(lambda event, name, value: events.append((event, name)))
+    scanner = SBOMScanner(False, offline=True, metrics=metrics)
+    result = scanner.scan(modules=["pip"])
+    assert ("phase", "scan") in events
+    assert ("phase", "package_creation") in events
+    # Measurements are recorded in the metrics of the scan
+    assert "scan" in result.metrics.phases
+    assert "scan" not in metrics.phases
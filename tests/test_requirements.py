@@ -0,0 +1,83 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import textwrap
+
+from sbom4python.scanner import SBOMScanner
+
+# Output of pip-compile --generate-hashes
+PIP_COMPILE = """\
+#
+# This file is autogenerated by pip-compile with Python 3.11
+#
+--index-url https://pypi.org/simple
+
+certifi==2024.2.2 \\
+    --hash=sha256:0569859f95fc761b18b45ef421b1290a0f65f147e92a1e5eb3e635f9a5e4e66f \\
+    --hash=sha256:dc383c07b76109f368f6106eee2b593b04a011ea4d55f652c6ca24a754d1cdd1
+    # via requests
+idna==3.4 \\
+    --hash=sha256:814f528e8dead7d329833b91c5faa87d60bf71824cd7a7da2e7a8e43e6b6f29d
+    # via requests
+requests==2.31.0 \\
+    --hash=sha256:58cd2187c01e70e6e26505bca751777aa9f2ee0b7f4300988b709f44e013003f
+    # via -r requirements.in
+urllib3==2.2.1 ; python_version >= "3.8" \\
+    --hash=sha256:450b20ec296a467077128bff42b73080516e71b56ff59a60a02bef2232c4fa9d
+-e .
+"""
+
+
+def test_pip_compile(tmp_path):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text(PIP_COMPILE)
+    scanner = SBOMScanner(False, offline=True)
+    result = scanner.scan(requirements=[str(requirements)])
+    assert set(result.packages) == {
+        ("certifi", "2024.2.2"),
+        ("idna", "3.4"),
+        ("requests", "2.31.0"),
+        ("urllib3", "2.2.1"),
+    }
+
+
+def test_invalid_requirement(tmp_path, capsys):
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text(
+        textwrap.dedent(
+            """\
+            requests==2.31.0
+            not a requirement==1.0
+            """
+        )
+    )
+    scanner = SBOMScanner(False, offline=True)
+    result = scanner.scan(requirements=[str(requirements)])
+    assert ("requests", "2.31.0") in result.packages
+    assert len(result.packages) == 1
+    assert "Unable to process requirement not a requirement" in capsys.readouterr().err
+
+
+def test_setup_py_markers(tmp_path):
+    setup = tmp_path / "setup.py"
+    setup.write_text(
+        textwrap.dedent(
+            """\
+            from setuptools import setup
+
+            setup(
+                name="example",
+                install_requires=[
+                    "requests==2.31.0",
+                    "tomli==2.0.1; python_version >= '3.8'",
+                    'toml==0.10.2; python_version < "3.0"',
+                ],
+            )
+            """
+        )
+    )
+    scanner = SBOMScanner(False, offline=True)
+    result = scanner.scan(requirements=[str(setup)])
+    packages = {p for p in result.packages if p[1] is not None}
+    # Requirement for Python 2 is not active
+    assert packages == {("requests", "2.31.0"), ("tomli", "2.0.1")}
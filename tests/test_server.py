@@ -0,0 +1,117 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from sbom4python.server import (
+    SBOMHTTPServer,
+    SBOMRequestHandler,
+    SBOMService,
+    ScanRequestError,
+)
+
+
+@pytest.fixture
+def server():
+    server = SBOMHTTPServer(("127.0.0.1", 0), SBOMRequestHandler)
+    service = SBOMService(offline=True, environments=["/srv/allowed"])
+    thread = threading.Thread(target=server.serve, args=(service, 1), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    content = response.read()
+    connection.close()
+    return response.status, content
+
+
+def test_status(server):
+    status, content = request(server, "GET", "/status")
+    assert status == 200
+    assert json.loads(content)["requests"] == 0
+
+
+def test_content_type_required(server):
+    status, _ = request(server, "POST", "/scan", body='{"module": "pip"}')
+    assert status == 415
+
+
+def test_origin_rejected(server):
+    headers = {"Content-Type": "application/json", "Origin": "http://example.com"}
+    status, _ = request(server, "POST", "/scan", '{"module": "pip"}', headers)
+    assert status == 403
+
+
+def test_host_rejected(server):
+    headers = {"Content-Type": "application/json", "Host": "example.com:8080"}
+    status, _ = request(server, "POST", "/scan", '{"module": "pip"}', headers)
+    assert status == 403
+
+
+def test_token_required(server):
+    server.token = "secret"
+    assert request(server, "GET", "/status")[0] == 401
+    headers = {"Authorization": "Bearer wrong"}
+    assert request(server, "GET", "/status", headers=headers)[0] == 401
+    headers = {"Authorization": "Bearer secret"}
+    assert request(server, "GET", "/status", headers=headers)[0] == 200
+
+
+def test_environment_not_permitted(server):
+    headers = {"Content-Type": "application/json"}
+    body = json.dumps({"environment": "/bin/true"})
+    status, content = request(server, "POST", "/scan", body, headers)
+    assert status == 400
+    assert "not permitted" in json.loads(content)["error"]
+
+
+def test_unknown_option_reported_first():
+    with pytest.raises(ScanRequestError, match="Unknown option modules"):
+        SBOMService().parse_request({"modules": "pip"})
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    allowed = tmp_path / "allowed"
+    (allowed / "app").mkdir(parents=True)
+    (allowed / "app" / "requirements.txt").write_text("requests==2.31.0\n")
+    (tmp_path / "secret.txt").write_text("private==1.0\n")
+    (allowed / "link.txt").symlink_to(tmp_path / "secret.txt")
+    return tmp_path
+
+
+def test_requirement_permitted(requirements):
+    service = SBOMService(requirement_dirs=[str(requirements / "allowed")])
+    filename = str(requirements / "allowed" / "app" / "requirements.txt")
+    assert service._requirements({"requirement": [filename]}) == [filename]
+    pattern = str(requirements / "allowed" / "**" / "requirements.txt")
+    assert service._requirements({"requirement": [pattern]}) == [filename]
+
+
+@pytest.mark.parametrize(
+    "requirement",
+    ["secret.txt", "allowed/../secret.txt", "allowed/link.txt", "*.txt", "**/*.txt"],
+)
+def test_requirement_not_permitted(requirements, requirement):
+    service = SBOMService(requirement_dirs=[str(requirements / "allowed")])
+    options = {"requirement": [str(requirements / requirement)]}
+    with pytest.raises(ScanRequestError, match="not permitted"):
+        service._requirements(options)
+
+
+def test_requirement_not_permitted_request(server):
+    headers = {"Content-Type": "application/json"}
+    body = json.dumps({"requirement": "/etc/**/*.txt"})
+    status, content = request(server, "POST", "/scan", body, headers)
+    assert status == 400
+    assert "not permitted" in json.loads(content)["error"]
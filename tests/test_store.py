@@ -0,0 +1,69 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+from lib4sbom.data.relationship import SBOMRelationship
+
+from sbom4python.scanner import SBOMScanner
+from sbom4python.store import RelationshipStore
+
+
+def relationship(source, relationship_type, target):
+    sbom_relationship = SBOMRelationship()
+    sbom_relationship.set_relationship(source, relationship_type, target)
+    return sbom_relationship.get_relationship()
+
+
+def edges(relationships):
+    return [(r["source"], r["type"], r["target"]) for r in relationships]
+
+
+def test_duplicate_relationships():
+    store = RelationshipStore()
+    assert store.append(relationship("Python-black", "DESCRIBES", "click"))
+    assert store.append(relationship("black", "DEPENDS_ON", "click"))
+    assert not store.append(relationship("Python-black", "DESCRIBES", "click"))
+    assert not store.append(relationship("black", "DEPENDS_ON", "click"))
+    assert edges(store) == [
+        ("Python-black", "DESCRIBES", "click"),
+        ("black", "DEPENDS_ON", "click"),
+    ]
+    assert relationship("black", "DEPENDS_ON", "click") in store
+    assert relationship("click", "DEPENDS_ON", "black") not in store
+
+
+def test_root_and_dependency(tmp_path):
+    # click is both a module being scanned and a dependency of black. The
+    # requirements file adds the relationships to the parent a second time
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("black\nclick\nblack\n")
+    scanner = SBOMScanner(False, offline=True)
+    result = scanner.scan(modules=["black", "click"], requirements=[str(requirements)])
+    found = edges(result.relationships)
+    assert len(found) == len(set(found))
+    assert ("black", "DEPENDS_ON", "click") in found
+    assert any(
+        target == "click" and relationship_type == "DESCRIBES"
+        for _, relationship_type, target in found
+    )
+
+
+def test_adjacency():
+    store = RelationshipStore()
+    store.append(relationship("Python-black", "DESCRIBES", "black"))
+    store.append(relationship("black", "DEPENDS_ON", "click"))
+    store.append(relationship("black", "DEPENDS_ON", "packaging"))
+    store.append(relationship("flask", "DEPENDS_ON", "click"))
+    store.append(relationship("black", "DEPENDS_ON", "click"))
+    assert edges(store.get_outgoing("black")) == [
+        ("black", "DEPENDS_ON", "click"),
+        ("black", "DEPENDS_ON", "packaging"),
+    ]
+    assert edges(store.get_incoming("click", "DEPENDS_ON")) == [
+        ("black", "DEPENDS_ON", "click"),
+        ("flask", "DEPENDS_ON", "click"),
+    ]
+    assert store.get_incoming("black", "DEPENDS_ON") == []
+    assert edges(store.get_incoming("black")) == [
+        ("Python-black", "DESCRIBES", "black")
+    ]
+    assert store.get_outgoing("requests") == []
@@ -0,0 +1,33 @@
+# Copyright (C) 2026 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+
+import pytest
+
+from sbom4python.cli import main
+
+# Elements of the SBOM which differ for each SBOM generated
+VARIABLE_ELEMENTS = re.compile(
+    r"(DocumentNamespace|documentNamespace|serialNumber|Created|created|timestamp)"
+    r"(\W+).*$",
+    re.MULTILINE,
+)
+
+
+def generate(tmp_path, sbom, bom_format, stream):
+    filename = tmp_path / f"{sbom}-{bom_format}{'-stream' if stream else ''}.out"
+    argv = ["sbom4python", "--module", "packaging", "--include-file", "--offline"]
+    argv += ["--no-cache", "--sbom", sbom, "--format", bom_format]
+    argv += ["--output-file", str(filename)] + (["--stream"] if stream else [])
+    assert main(argv) == 0
+    return VARIABLE_ELEMENTS.sub(r"\1\2", filename.read_text())
+
+
+@pytest.mark.parametrize(
+    "sbom, bom_format", [("spdx", "tag"), ("spdx", "json"), ("cyclonedx", "json")]
+)
+def test_stream_same_as_generator(tmp_path, sbom, bom_format):
+    expected = generate(tmp_path, sbom, bom_format, stream=False)
+    assert "packaging" in expected
+    assert generate(tmp_path, sbom, bom_format, stream=True) == expected